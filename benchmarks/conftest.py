@@ -0,0 +1,41 @@
+""" Apps and widget arguments shared by the benchmarks. """
+import dash_html_components as html
+import pytest
+
+from dasher import Dasher
+
+VALUES = [True, "text", 5, 0.5, (0, 10), (0.0, 1.0, 0.1), ["a", "b"], {"a": 1}]
+
+
+def _widget_kw(n_widgets):
+    return {f"w{i}": VALUES[i % len(VALUES)] for i in range(n_widgets)}
+
+
+def _echo(*args):
+    return [html.P(repr(args))]
+
+
+def _build_app(n_tabs, n_widgets, **kwargs):
+    app = Dasher(__name__, **kwargs)
+    for i in range(n_tabs):
+        app.callback(f"tab {i}", **_widget_kw(n_widgets))(_echo)
+    return app
+
+
+def pytest_generate_tests(metafunc):
+    if "widget_value" in metafunc.fixturenames:
+        metafunc.parametrize("widget_value", VALUES)
+
+
+@pytest.fixture
+def widget_kw():
+    """ Factory of the keyword arguments of the ``callback`` decorator generating
+    `n_widgets` widgets of all built-in types.
+    """
+    return _widget_kw
+
+
+@pytest.fixture
+def build_app():
+    """ Factory of apps with `n_tabs` tabs of `n_widgets` widgets each. """
+    return _build_app
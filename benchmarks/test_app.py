@@ -0,0 +1,49 @@
+import itertools
+
+import pytest
+
+OUTPUT = {"id": "dasher-output-tab_0", "property": "children"}
+TABS = {"id": "dasher-tabs-content", "property": "children"}
+
+
+def _update(client, output, outputs, inputs):
+    response = client.post(
+        "/_dash-update-component",
+        json={"output": output, "outputs": outputs, "inputs": inputs},
+    )
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize("n_widgets", [1, 10, 50])
+@pytest.mark.parametrize("n_tabs", [1, 10, 50])
+def test_callback_registration(benchmark, build_app, n_tabs, n_widgets):
+    app = benchmark.pedantic(build_app, (n_tabs, n_widgets), rounds=5)
+    assert len(app.callbacks) == n_tabs
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+def test_render_callback(benchmark, build_app, cached):
+    # with a single cached card, switching between two tabs renders every card
+    layout_kw = None if cached else {"max_cached_cards": 1}
+    layout = build_app(10, 20, layout_kw=layout_kw).api.layout
+    tabs = itertools.cycle(["tab_4", "tab_5"])
+    benchmark(lambda: layout.render_callback(next(tabs)))
+
+
+def test_tab_switch_round_trip(benchmark, build_app):
+    app = build_app(10, 20)
+    client = app.get_flask_server().test_client()
+    inputs = [{"id": "dasher-tabs", "property": "active_tab", "value": "tab_5"}]
+    benchmark(_update, client, "dasher-tabs-content.children", TABS, inputs)
+
+
+@pytest.mark.parametrize("n_widgets", [1, 10, 50])
+def test_callback_round_trip(benchmark, build_app, n_widgets):
+    app = build_app(1, n_widgets)
+    client = app.get_flask_server().test_client()
+    inputs = [
+        {"id": i.component_id, "property": i.component_property, "value": None}
+        for i in app.callbacks["tab_0"].inputs
+    ]
+    benchmark(_update, client, "dasher-output-tab_0.children", OUTPUT, inputs)
@@ -0,0 +1,47 @@
+import json
+
+import dash_core_components as dcc
+import numpy as np
+import plotly.graph_objs as go
+import pytest
+from plotly.utils import PlotlyJSONEncoder
+
+from dasher.encoding import Encoder
+
+pytest.importorskip("orjson")
+
+
+def _response(n_graphs=4, n_points=50000):
+    rng = np.random.default_rng(0)
+    x = np.arange(n_points)
+    graphs = []
+    for i in range(n_graphs):
+        y = rng.standard_normal(n_points).cumsum()
+        figure = {
+            "data": [
+                {"x": x, "y": y, "type": "scattergl"},
+                go.Bar(x=x[:100], y=y[:100]),
+            ],
+            "layout": {"title": f"graph {i}"},
+        }
+        graphs.append(dcc.Graph(id=f"graph-{i}", figure=figure))
+    return {"response": {"output": {"children": graphs}}, "multi": True}
+
+
+def _dash_dumps(obj):
+    return json.dumps(obj, cls=PlotlyJSONEncoder).encode("utf-8")
+
+
+ENCODINGS = {
+    "dash": _dash_dumps,
+    "orjson": Encoder().dumps,
+}
+
+
+@pytest.mark.parametrize("encoding", list(ENCODINGS))
+def test_encode_figures(benchmark, encoding):
+    dumps = ENCODINGS[encoding]
+    response = _response()
+    data = benchmark(dumps, response)
+    # compare the payload sizes in the saved results
+    benchmark.extra_info["bytes"] = len(data)
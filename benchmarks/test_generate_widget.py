@@ -0,0 +1,15 @@
+import pytest
+
+from dasher import Api
+
+
+@pytest.mark.parametrize("n_widgets", [10, 100, 1000, 10000])
+def test_generate_widgets(benchmark, widget_kw, n_widgets):
+    api = Api()
+    widgets = benchmark(api.generate_widgets, widget_kw(n_widgets))
+    assert len(widgets) == n_widgets
+
+
+def test_generate_widget(benchmark, widget_value):
+    api = Api()
+    benchmark(api.generate_widget, "w", widget_value)
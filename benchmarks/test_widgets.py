@@ -0,0 +1,19 @@
+import pytest
+
+from dasher.layout.bootstrap.widgets import IterableWidget
+from dasher.layout.bootstrap.widgets import TupleWidget
+
+
+def _component(widget_class, *args):
+    return widget_class(*args).component
+
+
+@pytest.mark.parametrize("n_steps", [10, 10**3, 10**6])
+def test_tuple_widget_component(benchmark, n_steps):
+    benchmark(_component, TupleWidget, "x", (0, n_steps, 1))
+
+
+@pytest.mark.parametrize("n_options", [10, 10**3, 10**5])
+def test_iterable_widget_component(benchmark, n_options):
+    options = [f"option {i}" for i in range(n_options)]
+    benchmark(_component, IterableWidget, "x", options)
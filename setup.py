@@ -77,5 +77,11 @@ setup(
         "dash-bootstrap-components>=0.6",
     ],
     extras_require={
+        "arrays": ["numpy", "pandas"],
+        "metrics": ["prometheus_client"],
+        "fast": ["orjson"],
+    },
+    entry_points={
+        "console_scripts": ["dasher = dasher.cli:main"],
     },
 )
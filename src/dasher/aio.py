@@ -0,0 +1,100 @@
+""" Execution of asynchronous callbacks.
+
+Callback functions defined with ``async def`` are run on an event loop, which is
+started in a background thread on first use. The request thread submits the coroutine
+to the loop and waits for its result, so that a callback can await several I/O-bound
+operations concurrently, e.g. using ``asyncio.gather``, while dash keeps calling it
+synchronously.
+
+Each process runs its own loop: a worker process forked from a process with a running
+loop starts a new loop on first use.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import TimeoutError
+from functools import wraps
+
+
+class EventLoop(object):
+    """ Event loop running in a background thread, which executes the coroutines of
+    asynchronous callbacks.
+
+    Parameters
+    ----------
+    timeout: float, optional
+        Maximum duration of a coroutine in seconds. Slower coroutines are cancelled
+        and raise ``concurrent.futures.TimeoutError``. Unlimited if ``None``.
+        Default: None.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """ The event loop of the current process, which is started if necessary. """
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="dasher-event-loop", daemon=True
+                )
+                thread.start()
+                self._loop, self._pid = loop, os.getpid()
+            return self._loop
+
+    def run(self, coroutine):
+        """ Run a coroutine on the event loop and wait for its result.
+
+        Parameters
+        ----------
+        coroutine: coroutine
+            The coroutine.
+
+        Returns
+        -------
+        object
+            The result of the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def close(self):
+        """ Stop the event loop of the current process, if it is running. """
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None and self._pid == os.getpid():
+            loop.call_soon_threadsafe(loop.stop)
+
+
+def synchronized(f, loop):
+    """ Wrap the coroutine function `f`, so that it is run on `loop` and its result is
+    returned synchronously.
+
+    Parameters
+    ----------
+    f: callable
+        The coroutine function.
+    loop: EventLoop
+        The event loop.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return loop.run(f(*args, **kwargs))
+
+    return wrapper
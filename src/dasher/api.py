@@ -1,11 +1,117 @@
+import inspect
+from abc import get_cache_token
 from collections.abc import Mapping
 from collections.abc import Sequence
+from functools import wraps
 
+from dash import no_update
 from dash.dependencies import Input
 from dash.dependencies import Output
+from dash.dependencies import State
+from dash.exceptions import PreventUpdate
 
+from dasher.aio import EventLoop
+from dasher.aio import synchronized
 from dasher.base import BaseLayout
 from dasher.base import generate_callback_id
+from dasher.cache import cached
+from dasher.downsample import downsampled
+from dasher.executors import FunctionReference
+from dasher.executors import executed
+from dasher.jobs import JobCancelled
+from dasher.jobs import streamed
+from dasher.memory import tracked
+from dasher.profiling import profiled
+from dasher.singleflight import coalesced
+
+
+def _dependencies(widgets):
+    """ Yield the component id and property of each dependency of the widgets. """
+    for w in widgets:
+        dependencies = (
+            w.dependency if isinstance(w.dependency, tuple) else (w.dependency,)
+        )
+        for dependency in dependencies:
+            yield w.name, dependency
+
+
+_THROTTLE_PREVIEW = """
+function() {
+    var n = %(n)d;
+    var args = Array.prototype.slice.call(arguments);
+    var drags = args.slice(0, n);
+    var values = args.slice(n, 2 * n);
+    var previous = args[2 * n];
+    var dragging = drags.some(function(d, i) {
+        return d !== undefined && d !== null &&
+            JSON.stringify(d) !== JSON.stringify(values[i]);
+    });
+    var now = Date.now();
+    if (!dragging || (previous && now - previous.time < %(interval)d)) {
+        return window.dash_clientside.no_update;
+    }
+    return {values: drags.map(function(d, i) { return d === null ? values[i] : d; }),
+            time: now};
+}
+"""
+
+_TOGGLE_PREVIEW = """
+function(preview, output) {
+    var n = %(n)d;
+    var args = Array.prototype.slice.call(arguments, 2);
+    var values = args.slice(0, n);
+    var drags = args.slice(n, 2 * n);
+    var triggered = window.dash_clientside.callback_context.triggered.map(
+        function(t) { return t.prop_id; }
+    );
+    var dragging = drags.some(function(d, i) {
+        return d !== undefined && d !== null &&
+            JSON.stringify(d) !== JSON.stringify(values[i]);
+    });
+    // released sliders, updated outputs and late previews hide the preview
+    var show = dragging && triggered.indexOf("%(preview)s") >= 0;
+    return [
+        Object.assign({}, args[2 * n], {display: show ? "none" : null}),
+        Object.assign({}, args[2 * n + 1], {display: show ? null : "none"})
+    ];
+}
+"""
+
+
+def _skip_trigger(f):
+    """ Wrap `f`, so that the value of the submit button, which triggers the callback in
+    submit mode, is not passed to `f`.
+    """
+
+    @wraps(f)
+    def wrapper(n_clicks, *args, **kwargs):
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+def _grouped(f, widgets):
+    """ Wrap `f`, so that the values of widgets with multiple dependencies, which dash
+    delivers as separate arguments, are passed to `f` as a tuple.
+    """
+    sizes = [
+        len(w.dependency) if isinstance(w.dependency, tuple) else None for w in widgets
+    ]
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        grouped = []
+        i = 0
+        for size in sizes:
+            if size is None:
+                grouped.append(args[i])
+                i += 1
+            else:
+                grouped.append(tuple(args[i : i + size]))
+                i += size
+        return f(*grouped, *args[i:], **kwargs)
+
+    return wrapper
 
 
 class Api(object):
@@ -28,6 +134,8 @@ class Api(object):
         if layout_kw is None:
             layout_kw = {}
         self.layout = self._load_layout(layout)(title, **layout_kw)
+        self._dispatch_cache = {}
+        self._dispatch_token = None
 
     @staticmethod
     def _load_layout(layout):
@@ -41,12 +149,37 @@ class Api(object):
             msg = "layout must be either a named layout or a subclass of DasherLayout"
             raise ValueError(msg)
 
+    def _dispatch(self, cls):
+        """ Look up the widget class for objects of type `cls`.
+        The first matching entry of the widget specification is resolved once per
+        type and cached, similar to ``functools.singledispatch``. The cache is
+        invalidated if the widget specification or the registrations of abstract base
+        classes change.
+        """
+        spec = self.layout.widget_spec
+        token = (get_cache_token(), tuple(spec.items()))
+        if token != self._dispatch_token:
+            self._dispatch_cache.clear()
+            self._dispatch_token = token
+        try:
+            return self._dispatch_cache[cls]
+        except KeyError:
+            pass
+        for type_spec, widget_cls in spec.items():
+            if issubclass(cls, type_spec):
+                break
+        else:
+            widget_cls = None
+        self._dispatch_cache[cls] = widget_cls
+        return widget_cls
+
     def generate_widget(self, name, x, label=None):
         """ Generate a dasher widget, which is a styled and labeled interactive
         component.
 
         The type of the interactive component is determined
         based on the type of `x` using the selected widget specification of the layout.
+        The lookup in the widget specification is cached per type of `x`.
 
         Parameters
         ----------
@@ -67,9 +200,9 @@ class Api(object):
         get_widget: Generates widget and returns the ``layout`` of the widget.
         get_component: Generates widget and returns the widgets' ``component``.
         """
-        for type_spec, component_cls in self.layout.widget_spec.items():
-            if isinstance(x, type_spec):
-                return component_cls(name, x, label)
+        widget_cls = self._dispatch(type(x))
+        if widget_cls is not None:
+            return widget_cls(name, x, label)
         raise NotImplementedError(
             f"No layout specification found for {name} of type {type(x)}"
         )
@@ -226,6 +359,9 @@ class Api(object):
         component using the ``value`` property. An ``dash.dependencies.Output`` is
         generated for `output_id` using the ``children`` property.
 
+        Widgets with a tuple of dependencies, e.g. a date range picker, generate one
+        input per property.
+
         Parameters
         ----------
         widgets: list of BaseWidget
@@ -242,13 +378,93 @@ class Api(object):
         input_list: list of dash.dependencies.Input
             List of generated input dependencies.
         """
-        input_list = [Input(w.name, w.dependency) for w in widgets]
+        input_list = [
+            Input(name, dependency) for name, dependency in _dependencies(widgets)
+        ]
         output = Output(output_id, output_dependency)
         return output, input_list
 
     @staticmethod
-    def register_callback(app, callback):
-        """ Register a dasher callback with dependencies in the dash app.
+    def generate_states(widgets):
+        """ Generate state dependencies for a list of widgets.
+        It generates a ``dash.dependencies.State`` for each widgets' underlying dash
+        component, which is used instead of an ``Input`` if the callback is triggered
+        by a submit button.
+
+        Parameters
+        ----------
+        widgets: list of BaseWidget
+            List of dasher widgets to generate dependencies for.
+
+        Returns
+        -------
+        list of dash.dependencies.State
+            List of generated state dependencies.
+        """
+        return [State(name, dependency) for name, dependency in _dependencies(widgets)]
+
+    @staticmethod
+    def wrap_function(callback):
+        """ Wrap the function of a dasher callback according to its options, e.g.
+        to run a coroutine function on the event loop of the callback, to execute it
+        in a process pool if the callback has an ``executor``, to memoize the results
+        if the callback has a ``cache`` and to coalesce identical concurrent calls if
+        the callback has a ``singleflight`` layer. Calls are sampled if the callback
+        has a ``profiler`` or a ``memory`` tracker and large figures are downsampled
+        if the callback has a ``downsample`` option. The values of widgets with
+        multiple dependencies are passed to the function as tuples and the value of
+        the submit button of callbacks in submit mode is dropped.
+
+        The function computing the cached results, i.e. without the executor, the
+        sampling and the cache, is stored as ``compute`` attribute of the callback.
+
+        Parameters
+        ----------
+        callback: DasherCallback
+            The dasher callback whose function is wrapped.
+
+        Returns
+        -------
+        callable
+            The wrapped function, which is registered in the dash app.
+        """
+        f = callback.f
+        if inspect.isgeneratorfunction(f):
+            f = streamed(f)
+        if inspect.iscoroutinefunction(f):
+            loop = callback.loop if callback.loop is not None else EventLoop()
+            f = synchronized(f, loop)
+        compute = f
+        if callback.downsample is not None:
+            compute = downsampled(f, callback.downsample, callback.id)
+        callback.compute = FunctionReference(
+            compute, qualname=f"{callback.f.__qualname__}.<compute>"
+        )
+        if callback.executor is not None:
+            f = executed(f, callback.executor)
+        # calls of process callbacks are sampled in the app process
+        if callback.memory is not None:
+            f = tracked(f, callback.memory, callback.id)
+        if callback.profiler is not None:
+            f = profiled(f, callback.profiler, callback.id)
+        if callback.downsample is not None:
+            # computes the output again if the traces of a zoomed graph are missing
+            callback.downsample.functions[callback.id] = _grouped(f, callback.widgets)
+            f = downsampled(f, callback.downsample, callback.id)
+        if callback.cache is not None:
+            f = cached(f, callback.cache)
+        if callback.singleflight is not None:
+            f = coalesced(f, callback.singleflight)
+        if any(isinstance(w.dependency, tuple) for w in callback.widgets):
+            f = _grouped(f, callback.widgets)
+        if callback.submit == "submit":
+            f = _skip_trigger(f)
+        return f
+
+    @staticmethod
+    def register_callback(app, callback, layout=None):
+        """ Register a dasher callback with dependencies in the dash app. The
+        callbacks required by the widgets of the callback are registered as well.
 
         Parameters
         ----------
@@ -256,8 +472,151 @@ class Api(object):
             The dash app.
         callback: DasherCallback
             The dasher callback to register.
+        layout: BaseLayout, optional
+            The layout of the app, which renders the components of background
+            callbacks and previews. Required by these callbacks.
         """
-        return app.callback(callback.outputs, callback.inputs)(callback.f)
+        if layout is None and (
+            callback.background is not None or callback.preview is not None
+        ):
+            raise ValueError(
+                f"callback {callback.name!r} requires the layout to be registered"
+            )
+        for widget in callback.widgets:
+            widget.register_callbacks(app)
+        if callback.downsample is not None:
+            callback.downsample.register_callbacks(
+                app, callback.id, Api.generate_states(callback.widgets)
+            )
+        if callback.preview is not None:
+            Api._register_preview_callbacks(app, callback, layout)
+        f = Api.wrap_function(callback)
+        if callback.background is not None:
+            return Api._register_background_callback(app, callback, f, layout)
+        return app.callback(callback.outputs, callback.inputs, callback.states)(f)
+
+    @staticmethod
+    def _register_background_callback(app, callback, f, layout):
+        """ Register a background callback. The widgets trigger the submission of a
+        job, whose id is stored in the browser session. Storing the id enables the
+        polling interval, which fetches the partial results of generator callbacks
+        and the result once the job has finished.
+        """
+        jobs = callback.background
+        job_id = f"{layout.job_base}-{callback.id}"
+        job_done_id = f"{layout.job_done_base}-{callback.id}"
+        poll_id = f"{layout.poll_base}-{callback.id}"
+
+        @wraps(callback.f)
+        def submit(*args):
+            *args, previous = args
+            if previous is not None:
+                jobs.cancel(previous)
+            return jobs.submit(f, args).id
+
+        def poll(n_intervals, current):
+            job = jobs.get(current)
+            if job is None:
+                # unknown jobs, e.g. started by another process, stop the polling
+                message = jobs.explain_unknown(current)
+                return layout.render_unknown_job(message), current
+            if not job.done():
+                published = job.progress.published
+                if published > job.sent:
+                    job.sent = published
+                    result = job.progress.result
+                    if callback.downsample is not None:
+                        result = callback.downsample.process(result, callback.id)
+                    return result, no_update
+                if job.sent:
+                    # keep the partial result until the next one is published
+                    raise PreventUpdate
+                return layout.render_job_status(job), no_update
+            try:
+                result = job.result()
+            except JobCancelled:
+                raise PreventUpdate
+            except Exception:
+                result = layout.render_job_status(job)
+            jobs.discard(current)
+            return result, current
+
+        app.callback(
+            [callback.outputs, Output(job_done_id, "data")],
+            [Input(poll_id, "n_intervals")],
+            [State(job_id, "data")],
+            prevent_initial_call=True,
+        )(poll)
+        app.clientside_callback(
+            "function(job, done) { return !job || job === done; }",
+            Output(poll_id, "disabled"),
+            [Input(job_id, "data"), Input(job_done_id, "data")],
+        )
+        return app.callback(
+            Output(job_id, "data"),
+            callback.inputs,
+            callback.states + [State(job_id, "data")],
+        )(submit)
+
+    @staticmethod
+    def _register_preview_callbacks(app, callback, layout):
+        """ Register the callbacks rendering the preview of a callback while its
+        sliders are dragged. A clientside callback throttles the values of the dragged
+        sliders into a store, which triggers the preview function on the server. The
+        preview container is shown while a slider is dragged. It is hidden as soon as
+        the sliders are released or the output of the full function is updated, so
+        that the preview does not outlive a drag if the output is not updated, e.g.
+        in submit mode, and late previews of finished drags are dropped.
+        """
+        dependencies = list(_dependencies(callback.widgets))
+        drags = [w for w in callback.widgets if w.drag_dependency is not None]
+        if not drags:
+            raise ValueError(f"callback {callback.name!r} has no slider to preview")
+        dragged = {w.name for w in drags}
+        request_id = f"{layout.preview_request_base}-{callback.id}"
+        preview_id = f"{layout.preview_base}-{callback.id}"
+        output = callback.outputs
+        drag_inputs = [Input(w.name, w.drag_dependency) for w in drags]
+        value_states = [State(w.name, w.dependency) for w in drags]
+
+        throttle = {"n": len(drags), "interval": layout.preview_interval}
+        app.clientside_callback(
+            _THROTTLE_PREVIEW % throttle,
+            Output(request_id, "data"),
+            drag_inputs,
+            value_states + [State(request_id, "data")],
+            prevent_initial_call=True,
+        )
+        app.clientside_callback(
+            _TOGGLE_PREVIEW % {"n": len(drags), "preview": f"{preview_id}.children"},
+            [Output(output.component_id, "style"), Output(preview_id, "style")],
+            [Input(preview_id, "children"), Input(output.component_id, "children")]
+            + [Input(w.name, w.dependency) for w in drags],
+            [State(w.name, w.drag_dependency) for w in drags]
+            + [State(output.component_id, "style"), State(preview_id, "style")],
+            prevent_initial_call=True,
+        )
+
+        f = callback.preview
+        if any(isinstance(w.dependency, tuple) for w in callback.widgets):
+            f = _grouped(f, callback.widgets)
+
+        def preview(request, *values):
+            if request is None:
+                raise PreventUpdate
+            values = list(values)
+            drag_values = iter(request["values"])
+            for i, (name, _) in enumerate(dependencies):
+                if name in dragged:
+                    values[i] = next(drag_values)
+            return f(*values)
+
+        app.callback(
+            Output(preview_id, "children"),
+            [Input(request_id, "data")],
+            [State(name, dependency) for name, dependency in dependencies],
+            prevent_initial_call=True,
+        )(preview)
 
     @staticmethod
     def generate_callback_id(name):
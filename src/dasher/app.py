@@ -1,9 +1,27 @@
 from copy import deepcopy
+from inspect import isgeneratorfunction
 
 import dash
+from dash.dependencies import Input
 
+from .aio import EventLoop
 from .api import Api
 from .base import Callback
+from .base import generate_callback_id
+from .cache import create_cache
+from .downsample import create_downsampler
+from .encoding import Encoder
+from .executors import ProcessExecutor
+from .executors import create_executor
+from .export import export
+from .jobs import JobManager
+from .memory import MemoryTracker
+from .memory import memory_report
+from .metrics import TABS
+from .metrics import Metrics
+from .precompute import precompute
+from .profiling import Profiler
+from .singleflight import create_singleflight
 
 
 class Dasher(object):
@@ -27,6 +45,38 @@ class Dasher(object):
         Dictionary of keyword arguments passed to the `layout` class.
     dash_kw: dict, optional
         Dictionary of keyword arguments passed to the dash app.
+    jobs_kw: dict, optional
+        Dictionary of keyword arguments passed to the ``dasher.jobs.JobManager``
+        running the background callbacks.
+    executor_kw: dict, optional
+        Dictionary of keyword arguments passed to the
+        ``dasher.executors.ProcessExecutor`` running the callbacks with
+        ``_executor="process"``, e.g. ``max_workers``, ``timeout`` and
+        ``max_tasks_per_child``.
+    metrics_kw: dict, optional
+        If not ``None``, the callbacks are instrumented with Prometheus metrics,
+        which are exposed at a route of the flask server. The dictionary is passed
+        as keyword arguments to ``dasher.metrics.Metrics``, e.g. ``{"route":
+        "/metrics"}``. Requires the ``prometheus_client`` package.
+    profiler_kw: dict, optional
+        If not ``None``, a fraction of the calls of all callback functions is
+        profiled and slow calls are captured with their arguments. The dictionary is
+        passed as keyword arguments to ``dasher.profiling.Profiler``, e.g.
+        ``{"directory": "profiles", "sample_rate": 0.01, "slow_threshold": 2}``.
+    memory_kw: dict, optional
+        If not ``None``, the peak allocation of a fraction of the calls of all
+        callback functions is measured and the memory report is exposed at a route
+        of the flask server. The dictionary is passed as keyword arguments to
+        ``dasher.memory.MemoryTracker``, e.g. ``{"sample_rate": 0.01}``.
+    encoding_kw: dict, optional
+        If not ``None``, the responses of the callbacks are encoded using
+        ``orjson`` instead of the JSON encoder of dash. The dictionary is passed as
+        keyword arguments to ``dasher.encoding.Encoder``. Requires the ``orjson``
+        package and dash 1.x.
+    loop_kw: dict, optional
+        Dictionary of keyword arguments passed to the ``dasher.aio.EventLoop``
+        running the callback functions defined with ``async def``, e.g.
+        ``{"timeout": 30}``.
 
     Attributes
     ----------
@@ -36,10 +86,36 @@ class Dasher(object):
         The dash app.
     callbacks: dict of Callback
         Dictionary containing the registered callbacks.
+    jobs: dasher.jobs.JobManager
+        Job manager running the background callbacks.
+    executor: dasher.executors.ProcessExecutor
+        Process pool running the callbacks with ``_executor="process"``.
+    metrics: dasher.metrics.Metrics or None
+        Prometheus metrics of the callbacks, if enabled by ``metrics_kw``.
+    profiler: dasher.profiling.Profiler or None
+        Profiler of the callbacks, if enabled by ``profiler_kw``.
+    memory: dasher.memory.MemoryTracker or None
+        Memory tracker of the callbacks, if enabled by ``memory_kw``.
+    encoder: dasher.encoding.Encoder or None
+        Encoder of the callback responses, if enabled by ``encoding_kw``.
+    loop: dasher.aio.EventLoop
+        Event loop running the asynchronous callback functions of this process.
     """
 
     def __init__(
-        self, name, title=None, layout="bootstrap", layout_kw=None, dash_kw=None
+        self,
+        name,
+        title=None,
+        layout="bootstrap",
+        layout_kw=None,
+        dash_kw=None,
+        jobs_kw=None,
+        executor_kw=None,
+        metrics_kw=None,
+        profiler_kw=None,
+        memory_kw=None,
+        encoding_kw=None,
+        loop_kw=None,
     ):
         self.api = Api(title, layout, layout_kw)
 
@@ -50,6 +126,21 @@ class Dasher(object):
 
         self.app.layout = self.api.layout.layout
         self.callbacks = {}
+        self.jobs = JobManager(**(jobs_kw if jobs_kw is not None else {}))
+        self.executor = ProcessExecutor(
+            **(executor_kw if executor_kw is not None else {})
+        )
+        self.metrics = None
+        if metrics_kw is not None:
+            self.metrics = Metrics(**metrics_kw)
+            self.metrics.register_route(self.app.server)
+        self.profiler = Profiler(**profiler_kw) if profiler_kw is not None else None
+        self.memory = None
+        if memory_kw is not None:
+            self.memory = MemoryTracker(**memory_kw)
+            self.memory.register_route(self.app.server, self)
+        self.encoder = Encoder(**encoding_kw) if encoding_kw is not None else None
+        self.loop = EventLoop(**(loop_kw if loop_kw is not None else {}))
 
     def _update_external_stylesheets(self, dash_kw):
         kw = deepcopy(dash_kw)
@@ -57,7 +148,21 @@ class Dasher(object):
         kw["external_stylesheets"] = layout_sheets + kw.get("external_stylesheets", [])
         return kw
 
-    def callback(self, _name, _desc=None, _labels=None, _layout_kw=None, **kwargs):
+    def callback(
+        self,
+        _name,
+        _desc=None,
+        _labels=None,
+        _layout_kw=None,
+        _cache=None,
+        _background=False,
+        _executor=None,
+        _submit=None,
+        _singleflight=None,
+        _downsample=None,
+        _preview=None,
+        **kwargs,
+    ):
         """ Decorator, which defines a callback function.
         Each callback function results in a tab in the app. The keywords arguments
         are the input arguments of the callback function. Simultaneously, the types of
@@ -65,7 +170,8 @@ class Dasher(object):
 
         The decorated callback function must return a list of dash components. It
         defines the content of the tab, which is controlled by the generated interactive
-        widgets.
+        widgets. Callback functions defined with ``async def`` are run on the event
+        loop of the app (see ``loop_kw``), so that they can await I/O concurrently.
 
         Supported widget types are determined by the layouts' widget specification. The
         built-in widget specifications are compatible with ``ipywidgets.interact``
@@ -105,10 +211,66 @@ class Dasher(object):
             Dictionary of keyword arguments passed to the ``add_callback`` method of the
             layout, which may be used to override layout defaults for individual
             callbacks.
+        _cache: bool or dict or dasher.cache.BaseCache, optional
+            Memoize the results of the callback function based on the widget values.
+            If ``True``, an in-memory LRU cache with default settings is used. A
+            dictionary is passed as keyword arguments to the cache backend, e.g.
+            ``{"maxsize": 64, "max_bytes": 2**27, "ttl": 600}`` for an in-memory
+            cache or ``{"backend": "sqlite", "path": "cache.db"}`` for a persistent
+            cache shared by all worker processes. The statistics of the cache are
+            available using ``Callback.cache_info``.
+        _background: bool, optional
+            If true, the callback function is executed in a background thread pool
+            (see ``jobs_kw``) instead of the request thread. A placeholder showing the
+            progress is displayed until the result is ready. If the callback function
+            accepts a ``_progress`` keyword argument, it receives a
+            ``dasher.jobs.Progress`` handle to report its progress. A newer request
+            from the same browser session cancels the job it replaces. Callback
+            functions written as generators are always executed in the background:
+            every yielded value is displayed as a partial result and the last one is
+            the final result.
+        _executor: str or dasher.executors.ProcessExecutor, optional
+            If ``"process"``, the callback function is executed in the process pool
+            of the app (see ``executor_kw``) instead of the request thread, which
+            allows CPU-bound callbacks to run in parallel. A ``ProcessExecutor``
+            instance may be passed to use a separate pool for the callback. The
+            callback function and its return value must be picklable. Generator
+            functions can't be executed in a process pool.
+        _submit: str, optional
+            Submission mode of the widgets. By default, the callback is executed
+            whenever a widget changes. ``"debounce"`` updates text inputs only when the
+            user presses enter or the input loses focus. ``"submit"`` adds an "Apply"
+            button to the widgets, which triggers the callback, so that changing the
+            widgets does not execute the callback.
+        _singleflight: bool or dict or dasher.singleflight.SingleFlight, optional
+            Coalesce identical concurrent calls of the callback function, i.e. calls
+            with the same widget values: later calls wait for the running call and
+            share its result. If ``True``, calls are coalesced within each process.
+            ``{"backend": "file", "directory": "locks"}`` additionally serializes
+            identical calls of multiple worker processes using lock files, which
+            should be combined with a shared ``_cache``. The counters are available
+            using ``Callback.singleflight_info``.
+        _downsample: bool or int or dict or dasher.downsample.Downsampler, optional
+            Downsample the line and scatter traces of ``dcc.Graph`` figures returned
+            by the callback function, which exceed a maximum number of points. If
+            ``True``, traces are reduced to 2000 points using LTTB, an integer sets
+            the maximum number of points and a dictionary is passed as keyword
+            arguments to ``Downsampler``, e.g. ``{"method": "minmax"}``. When the
+            user zooms, the visible window is downsampled from the full-resolution
+            data again. Requires ``numpy``.
+        _preview: callable, optional
+            Cheap function with the same signature as the callback function, which
+            renders a preview while a slider of the callback is dragged. It is called
+            with the dragged values at most every ``preview_interval`` milliseconds of
+            the layout, while the callback function is only called when the slider is
+            released. The preview is shown instead of the output until the output of
+            the callback function is updated.
         kwargs
             Keyword arguments that are the input arguments to the callback function,
             which also define the widgets that are generated for the dashboard.
-            Obviously, reserved keywords are `_name`, `_desc`, `_labels` and `_layout`.
+            Obviously, reserved keywords are `_name`, `_desc`, `_labels`, `_layout_kw`,
+            `_cache`, `_background`, `_executor`, `_submit`, `_singleflight`,
+            `_downsample` and `_preview`.
 
         Returns
         -------
@@ -122,7 +284,13 @@ class Dasher(object):
 
         """
 
+        if _submit not in (None, "debounce", "submit"):
+            raise ValueError("_submit must be None, 'debounce' or 'submit'")
+
         def function_wrapper(f):
+            if isgeneratorfunction(f) and _executor is not None:
+                # partial results are published to the job in the process of the app
+                raise ValueError("generator functions can't be combined with _executor")
             layout = _layout_kw if _layout_kw is not None else {}
 
             callback_id = self.api.generate_callback_id(_name)
@@ -131,7 +299,17 @@ class Dasher(object):
             outputs, inputs = self.api.generate_dependencies(
                 widgets, f"{self.api.layout.output_base}-{callback_id}"
             )
+            states = []
+            if _submit == "debounce":
+                for widget in widgets:
+                    widget.debounce = True
+            elif _submit == "submit":
+                states = self.api.generate_states(widgets)
+                submit_id = f"{self.api.layout.submit_base}-{callback_id}"
+                inputs = [Input(submit_id, "n_clicks")]
 
+            # generator functions stream their partial results from the background
+            background = _background or isgeneratorfunction(f)
             callback = Callback(
                 name=_name,
                 description=_desc,
@@ -142,21 +320,114 @@ class Dasher(object):
                 outputs=outputs,
                 inputs=inputs,
                 layout_kw=_layout_kw,
+                cache=create_cache(_cache, callback_id),
+                background=self.jobs if background else None,
+                executor=create_executor(_executor, self.executor),
+                submit=_submit,
+                states=states,
+                singleflight=create_singleflight(_singleflight),
+                profiler=self.profiler,
+                memory=self.memory,
+                downsample=create_downsampler(_downsample),
+                loop=self.loop,
+                preview=_preview,
             )
             self.callbacks[callback.id] = callback
 
+            registered = set(self.app.callback_map)
             self.api.layout.add_callback(callback, self.app, **layout)
-            return self.api.register_callback(self.app, callback)
+            tab_outputs = set(self.app.callback_map) - registered
+            registered.update(tab_outputs)
+            wrapped = self.api.register_callback(self.app, callback, self.api.layout)
+            if self.encoder is not None and callback.background is None:
+                self.encoder.install(self.app, callback.outputs)
+            if self.metrics is not None:
+                for output in tab_outputs:
+                    self.metrics.instrument(self.app, output, TABS)
+                for output in set(self.app.callback_map) - registered:
+                    self.metrics.instrument(self.app, output, callback.id)
+            return wrapped
 
         return function_wrapper
 
+    def precompute(self, callback_name, workers=None, **kwargs):
+        """ Fill the cache of a callback with the results of all combinations of its
+        widget values, evaluated in a process pool. The callback must use the
+        ``_cache`` option and all its widgets must have finitely many values, e.g.
+        dropdowns, checkboxes and sliders.
+
+        Large grids are sampled and combinations already present in the cache are
+        skipped, so that an interrupted precomputation resumes where it stopped if
+        the cache is persistent.
+
+        Parameters
+        ----------
+        callback_name: str
+            Name or id of the callback.
+        workers: int, optional
+            Number of worker processes. If 0, the combinations are evaluated in the
+            calling process. Default: number of CPUs.
+        **kwargs:
+            Keyword arguments passed to ``dasher.precompute.precompute``, e.g.
+            ``max_points`` and ``progress``.
+
+        Returns
+        -------
+        dasher.precompute.PrecomputeInfo
+            Statistics of the precomputation.
+        """
+        callback_id = generate_callback_id(callback_name)
+        if callback_id not in self.callbacks:
+            raise KeyError(f"unknown callback {callback_name!r}")
+        return precompute(self.callbacks[callback_id], workers=workers, **kwargs)
+
+    def export(self, path, workers=None, max_points=None):
+        """ Export the app to a static site, which can be served by any static file
+        server without Python workers. The responses of all tabs and all
+        combinations of widget values are evaluated in a process pool and written to
+        `path` along with the index page and the JavaScript bundles. All widgets
+        must have finitely many values. The same is available on the command line
+        as ``dasher export module:app path``.
+
+        Parameters
+        ----------
+        path: str
+            Output directory.
+        workers: int, optional
+            Number of worker processes. If 0, the requests are evaluated in the
+            calling process. Default: number of CPUs.
+        max_points: int, optional
+            Maximum number of widget value combinations per callback. Larger grids
+            are sampled. Unlimited if ``None``.
+
+        Returns
+        -------
+        dasher.export.ExportInfo
+            Statistics of the export.
+        """
+        return export(self, path, workers=workers, max_points=max_points)
+
+    def memory_report(self):
+        """ Report the memory retained by each tab: the widgets and the rendered card
+        held by the layout, the keyword arguments of the callback and its cache
+        entries. If ``memory_kw`` is given, the report includes the sampled peak
+        allocation of the callback calls.
+
+        Returns
+        -------
+        list of dasher.memory.TabMemory
+            Memory report of each tab, sorted by retained size.
+        """
+        return memory_report(self)
+
     def get_flask_server(self):
         """ Returns the flask app object. """
         return self.app.server
 
     def run_server(self, *args, **kw):
-        """ Runs the dasher app server by calling the underlying ``dash.Dash.run_server``
-        method. Refer to the documentation of ``dash.Dash.run_server`` for details.
+        """ Runs the dasher app server by calling the underlying
+        ``dash.Dash.run_server`` method. Refer to the documentation of
+        ``dash.Dash.run_server`` for details.
 
         Parameters
         ----------
@@ -3,6 +3,8 @@ from abc import ABC
 from abc import abstractmethod
 from collections import OrderedDict
 
+import dash_core_components as dcc
+import dash_html_components as html
 from dash.development.base_component import Component
 
 
@@ -25,11 +27,38 @@ def generate_callback_id(name):
     return re.sub(r"\W+", "_", name).lower()
 
 
+class cached_property(object):
+    """ Decorator for a property of a widget, which is computed once per instance.
+    The computed value is stored in the ``__dict__`` of the instance, which shadows
+    the descriptor on subsequent accesses. ``BaseWidget.invalidate`` removes it.
+
+    Parameters
+    ----------
+    func: callable
+        Getter method computing the value of the property.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
 class BaseWidget(ABC):
     """ Abstract base class of a dasher widget.
     A dasher widget is an interactive control, which consists of an interactive dash
     `component`, a `label` and a final `layout`.
 
+    Implementations should decorate `component` and `layout` with ``cached_property``,
+    so that the dash components are built only once. Call `invalidate` to rebuild them
+    after modifying the widget.
+
     Parameters
     ----------
     name: str
@@ -40,9 +69,10 @@ class BaseWidget(ABC):
         The label for the dash component.
     layout: dash.development.base_component.Component
         The `layout` is a styled and labeled version of `component`.
-    dependency: str, optional
-        The attribute used for the ``dash.dependencies.Input`` dependency.
-        Default: "value".
+    dependency: str or tuple of str, optional
+        The attribute used for the ``dash.dependencies.Input`` dependency. A tuple of
+        attributes generates multiple dependencies, whose values are passed to the
+        callback function as a tuple. Default: "value".
 
     Attributes
     ----------
@@ -56,11 +86,21 @@ class BaseWidget(ABC):
         The label for the dash component.
     layout: dash.development.base_component.Component
         The `layout` is a styled and labeled version of `component`.
-    dependency: str, optional
-        The attribute used for the ``dash.dependencies.Input`` dependency.
-        Default: "value".
+    dependency: str or tuple of str, optional
+        The attribute used for the ``dash.dependencies.Input`` dependency. A tuple of
+        attributes generates multiple dependencies, whose values are passed to the
+        callback function as a tuple. Default: "value".
     """
 
+    debounce = False
+    """ If true, the widget should only update its dependency once the user has
+    finished the input, e.g. when a text input loses focus. """
+
+    drag_dependency = None
+    """ Attribute of the component, which is updated continuously while the user drags
+    it, e.g. the ``drag_value`` of sliders, or ``None``. Its changes trigger the
+    ``_preview`` function of a callback. """
+
     def __init__(self, name, x, label=None, dependecy="value"):
         self.name = name
         self.x = x
@@ -93,6 +133,37 @@ class BaseWidget(ABC):
         """
         pass
 
+    def invalidate(self):
+        """ Discard the cached `component` and `layout`, so that they are built again
+        on the next access.
+        """
+        for name in ("component", "layout"):
+            self.__dict__.pop(name, None)
+
+    def domain(self):
+        """ Return all values the widget can deliver to the callback function, which
+        are precomputed by ``Dasher.precompute``. The default implementation returns
+        ``None``, which means that the values can not be enumerated, e.g. for text
+        inputs.
+
+        Returns
+        -------
+        list or None
+            The values of the widget.
+        """
+        return None
+
+    def register_callbacks(self, app):
+        """ Register callbacks required by the widget itself in the dash app, e.g. to
+        load options from the server. The default implementation does nothing.
+
+        Parameters
+        ----------
+        app: dash.Dash
+            The dash app.
+        """
+        pass
+
 
 class CustomWidget(object):
     """ Wrapper class for custom widgets.
@@ -124,11 +195,11 @@ class WidgetPassthroughMixin(BaseWidget, ABC):
         else:
             super().__init__(name, x, label)
 
-    @property
+    @cached_property
     def component(self):
         if getattr(self.x, "id", None) is None:
             self.x.id = self.name
-        else:
+        elif self.x.id != self.name:
             raise ValueError("Component id must be empty.")
         return self.x
 
@@ -149,6 +220,9 @@ class BaseLayout(ABC):
     the child class must announce this by creating an `external_stylesheets` attribute
     containing the list of required external stylesheets.
 
+    The layout of a background callback must contain the components returned by
+    `render_background_components`, which are used to poll for the result.
+
     Parameters
     ----------
     title: str
@@ -169,6 +243,14 @@ class BaseLayout(ABC):
     """
 
     output_base = "dasher-output"
+    submit_base = "dasher-submit"
+    job_base = "dasher-job"
+    job_done_base = "dasher-job-done"
+    poll_base = "dasher-poll"
+    poll_interval = 500
+    preview_base = "dasher-preview"
+    preview_request_base = "dasher-preview-request"
+    preview_interval = 100
 
     def __init__(self, title, widget_spec, credits=True):
         if title is None:
@@ -201,6 +283,123 @@ class BaseLayout(ABC):
         """
         pass
 
+    def render_background_components(self, callback):
+        """ Render the components used by a background callback to poll for its
+        result: a store for the id of the current job, a store for the id of the last
+        finished job and the interval triggering the polling.
+
+        Parameters
+        ----------
+        callback: Callback
+            The background callback.
+
+        Returns
+        -------
+        list of dash.development.base_component.Component
+            Components, which must be part of the layout of the callback.
+        """
+        return [
+            dcc.Store(id=f"{self.job_base}-{callback.id}"),
+            dcc.Store(id=f"{self.job_done_base}-{callback.id}"),
+            dcc.Interval(
+                id=f"{self.poll_base}-{callback.id}",
+                interval=self.poll_interval,
+                disabled=True,
+            ),
+        ]
+
+    def render_preview_components(self, callback):
+        """ Render the components used by a callback with a preview function: a store
+        for the throttled widget values while dragging and the hidden container of
+        the preview, which is shown instead of the output container while dragging.
+
+        Parameters
+        ----------
+        callback: Callback
+            The callback with a preview function.
+
+        Returns
+        -------
+        list of dash.development.base_component.Component
+            Components, which must be part of the layout of the callback.
+        """
+        return [
+            dcc.Store(id=f"{self.preview_request_base}-{callback.id}"),
+            html.Div(
+                id=f"{self.preview_base}-{callback.id}", style={"display": "none"}
+            ),
+        ]
+
+    def render_job_status(self, job):
+        """ Render the placeholder shown while a background job is running or the
+        error message if it failed.
+
+        Parameters
+        ----------
+        job: dasher.jobs.Job
+            The background job.
+
+        Returns
+        -------
+        list of dash.development.base_component.Component
+            Content of the output container.
+        """
+        if job.done():
+            return [html.Div(f"Error: {job.future.exception()}")]
+        fraction = job.progress.fraction
+        status = "Running" if fraction is None else f"Running ({fraction:.0%})"
+        if job.progress.message is not None:
+            status = f"{status}: {job.progress.message}"
+        return [html.Div(status)]
+
+    def render_unknown_job(self, message):
+        """ Render the error message shown if the job of a background callback is
+        unknown to the process handling the poll.
+
+        Parameters
+        ----------
+        message: str
+            The reason why the job is unknown.
+
+        Returns
+        -------
+        list of dash.development.base_component.Component
+            Content of the output container.
+        """
+        return [html.Div(f"Error: {message}")]
+
+    def retained(self, callback_id):
+        """ Return the objects the layout retains for a callback in addition to the
+        widgets, e.g. a rendered card, which are accounted for by the memory report
+        of the app. The default implementation returns an empty list.
+
+        Parameters
+        ----------
+        callback_id: str
+            Id of the callback.
+
+        Returns
+        -------
+        list
+            Retained objects.
+        """
+        return []
+
+    def export_requests(self):
+        """ Return the requests of the callbacks rendering the tabs, which are
+        evaluated by the static export of the app. The default implementation returns
+        an empty list.
+
+        Returns
+        -------
+        list of tuple
+            Tuples ``(callback_output, output, inputs)`` of the output dependency of
+            the callback as registered in the app, the output dependency of the
+            request, which differs for pattern-matching callbacks, and a list of
+            tuples of input dependencies and their values.
+        """
+        return []
+
 
 class Callback(object):
     """ This class contains the specification of a callback.
@@ -225,6 +424,36 @@ class Callback(object):
         Input dependencies for the callback
     layout_kw: dict or None
         Keyword arguments to override default layout settings for the callback.
+    cache: dasher.cache.BaseCache or None, optional
+        Cache used to memoize the results of the callback function.
+    background: dasher.jobs.JobManager or None, optional
+        If not ``None``, the callback function is executed in the background using
+        this job manager.
+    executor: dasher.executors.ProcessExecutor or None, optional
+        If not ``None``, the callback function is executed in a worker process of
+        this executor.
+    submit: str or None, optional
+        Submission mode of the widgets. ``"debounce"`` debounces the widgets and
+        ``"submit"`` triggers the callback by a submit button.
+    states: list of dash.dependencies.State, optional
+        State dependencies for the callback.
+    singleflight: dasher.singleflight.SingleFlight or None, optional
+        If not ``None``, identical concurrent calls of the callback function are
+        coalesced using this single-flight layer.
+    profiler: dasher.profiling.Profiler or None, optional
+        If not ``None``, calls of the callback function are sampled by this
+        profiler.
+    memory: dasher.memory.MemoryTracker or None, optional
+        If not ``None``, the peak allocation of calls of the callback function is
+        sampled by this tracker.
+    downsample: dasher.downsample.Downsampler or None, optional
+        If not ``None``, the figures returned by the callback function are
+        downsampled by this downsampler.
+    loop: dasher.aio.EventLoop or None, optional
+        Event loop running the callback function if it is a coroutine function.
+    preview: callable or None, optional
+        Cheap function with the signature of the callback function, which renders a
+        preview while a slider is dragged.
 
     Attributes
     ----------
@@ -246,10 +475,67 @@ class Callback(object):
         Input dependencies for the callback.
     layout_kw: dict or None
         Keyword arguments to override default layout settings for the callback.
+    cache: dasher.cache.BaseCache or None
+        Cache used to memoize the results of the callback function.
+    background: dasher.jobs.JobManager or None
+        If not ``None``, the callback function is executed in the background using
+        this job manager.
+    executor: dasher.executors.ProcessExecutor or None
+        If not ``None``, the callback function is executed in a worker process of
+        this executor.
+    submit: str or None
+        Submission mode of the widgets. ``"debounce"`` debounces the widgets and
+        ``"submit"`` triggers the callback by a submit button.
+    states: list of dash.dependencies.State
+        State dependencies for the callback.
+    singleflight: dasher.singleflight.SingleFlight or None
+        If not ``None``, identical concurrent calls of the callback function are
+        coalesced using this single-flight layer.
+    profiler: dasher.profiling.Profiler or None
+        If not ``None``, calls of the callback function are sampled by this
+        profiler.
+    memory: dasher.memory.MemoryTracker or None
+        If not ``None``, the peak allocation of calls of the callback function is
+        sampled by this tracker.
+    downsample: dasher.downsample.Downsampler or None
+        If not ``None``, the figures returned by the callback function are
+        downsampled by this downsampler.
+    loop: dasher.aio.EventLoop or None
+        Event loop running the callback function if it is a coroutine function.
+    preview: callable or None
+        Cheap function with the signature of the callback function, which renders a
+        preview while a slider is dragged.
+    layout: dash.development.base_component.Component or None
+        Card of the callback in the app layout.
+    compute: dasher.executors.FunctionReference or None
+        Picklable reference to the callback function as wrapped by the api up to its
+        cache, i.e. coroutine functions run on the event loop, generators are consumed
+        and figures downsampled. It computes the results, which are cached or
+        precomputed. ``None`` until the callback is registered.
     """
 
     def __init__(
-        self, name, description, f, kw, labels, widgets, outputs, inputs, layout_kw
+        self,
+        name,
+        description,
+        f,
+        kw,
+        labels,
+        widgets,
+        outputs,
+        inputs,
+        layout_kw,
+        cache=None,
+        background=None,
+        executor=None,
+        submit=None,
+        states=None,
+        singleflight=None,
+        profiler=None,
+        memory=None,
+        downsample=None,
+        loop=None,
+        preview=None,
     ):
         self.id = generate_callback_id(name)
         self.name = name
@@ -261,3 +547,56 @@ class Callback(object):
         self.outputs = outputs
         self.inputs = inputs
         self.layout_kw = layout_kw
+        self.cache = cache
+        self.background = background
+        self.executor = executor
+        self.submit = submit
+        self.states = states if states is not None else []
+        self.singleflight = singleflight
+        self.profiler = profiler
+        self.memory = memory
+        self.downsample = downsample
+        self.loop = loop
+        self.preview = preview
+        self.compute = None
+        self._layout = None
+        self._card = None
+
+    @property
+    def layout(self):
+        """ Card of the callback in the app layout or ``None`` if the callback has
+        not been added to a layout. Layouts, which render cards lazily, render the card
+        on first access using their ``get_card`` method.
+        """
+        if self._card is not None or self._layout is None:
+            return self._card
+        return self._layout.get_card(self.id)
+
+    @layout.setter
+    def layout(self, card):
+        self._card = card
+
+    def cache_info(self):
+        """ Return the hit, miss and eviction counters of the result cache.
+
+        Returns
+        -------
+        dasher.cache.CacheInfo or None
+            Statistics of the result cache or ``None`` if caching is disabled.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.info()
+
+    def singleflight_info(self):
+        """ Return the counters of the single-flight layer.
+
+        Returns
+        -------
+        dasher.singleflight.FlightInfo or None
+            Statistics of the single-flight layer or ``None`` if coalescing is
+            disabled.
+        """
+        if self.singleflight is None:
+            return None
+        return self.singleflight.info()
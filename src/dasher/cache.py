@@ -0,0 +1,513 @@
+""" Result caches for dasher callbacks.
+
+A callback decorated with the ``_cache`` option is memoized on the widget values
+delivered by dash. The cached results are stored in their pickled form, which allows
+evicting entries by their serialized size and guarantees that a cached result can not
+be modified by the caller.
+
+Two backends are available: ``MemoryCache`` keeps the results in the memory of the
+process, while ``SQLiteCache`` stores them in a SQLite database, which is shared by
+all worker processes of a WSGI server and survives restarts.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import types
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from collections import namedtuple
+from functools import wraps
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "size", "nbytes", "unpicklable"]
+)
+""" Cache statistics, as returned by ``BaseCache.info``. """
+
+
+def _hash_code(code, h):
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(const, h)
+        elif isinstance(const, frozenset):
+            # the iteration order of sets depends on the hash seed of the process
+            h.update(repr(sorted(map(repr, const))).encode("utf-8"))
+        else:
+            h.update(repr(const).encode("utf-8"))
+
+
+def function_fingerprint(f):
+    """ Generate a fingerprint of the function `f`.
+    It consists of the qualified name of `f` and a hash of its code, so that changing
+    the implementation of a callback invalidates its cached results.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function.
+
+    Returns
+    -------
+    str
+        Fingerprint of `f`.
+    """
+    f = inspect.unwrap(f)
+    name = f"{getattr(f, '__module__', None)}.{getattr(f, '__qualname__', f)}"
+    code = getattr(f, "__code__", None)
+    if code is None:
+        return name
+    h = hashlib.sha256()
+    _hash_code(code, h)
+    return f"{name}:{h.hexdigest()}"
+
+
+def generate_cache_key(f, args, fingerprint=None):
+    """ Generate the cache key of a call of `f` with the arguments `args`.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function.
+    args: tuple
+        Positional arguments of the call, i.e. the widget values delivered by dash.
+    fingerprint: str, optional
+        Precomputed ``function_fingerprint`` of `f`.
+
+    Returns
+    -------
+    str
+        Hex digest identifying the function, its code and the arguments.
+    """
+    if fingerprint is None:
+        fingerprint = function_fingerprint(f)
+    values = json.dumps(args, sort_keys=True, default=repr)
+    return hashlib.sha256(f"{fingerprint}:{values}".encode("utf-8")).hexdigest()
+
+
+class BaseCache(ABC):
+    """ Abstract base class of a dasher result cache.
+    A child class must implement the `_get` and `_set` methods, while the counting
+    of hits, misses and evictions is handled by the base class.
+
+    Attributes
+    ----------
+    hits: int
+        Number of cache hits.
+    misses: int
+        Number of cache misses.
+    evictions: int
+        Number of evicted entries.
+    unpicklable: int
+        Number of values, which were not stored because they can't be pickled.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.unpicklable = 0
+        self._counter_lock = threading.Lock()
+
+    def _count(self, counter, n=1):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    @abstractmethod
+    def _get(self, key):
+        """ Return the pickled value stored for `key` or ``None`` if not present. """
+        pass
+
+    @abstractmethod
+    def _set(self, key, data):
+        """ Store the pickled value `data` for `key`. """
+        pass
+
+    def __len__(self):
+        return 0
+
+    def __contains__(self, key):
+        # membership tests do not count as hits or misses
+        return self._get(key) is not None
+
+    @property
+    def nbytes(self):
+        """ Total size of the stored values in bytes. """
+        return 0
+
+    def get(self, key):
+        """ Look up `key` in the cache.
+
+        Parameters
+        ----------
+        key: str
+            The cache key.
+
+        Returns
+        -------
+        hit: bool
+            True if the key was found in the cache.
+        value: object
+            The cached value or ``None`` in case of a cache miss.
+        """
+        data = self._get(key)
+        if data is None:
+            self._count("misses")
+            return False, None
+        self._count("hits")
+        return True, pickle.loads(data)
+
+    def set(self, key, value):
+        """ Store `value` for `key` in the cache. Values, which can't be pickled, e.g.
+        because they contain a lock, are not stored and counted as `unpicklable`.
+
+        Parameters
+        ----------
+        key: str
+            The cache key.
+        value: object
+            The value to store.
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self._count("unpicklable")
+            return
+        self._set(key, data)
+
+    def info(self):
+        """ Return the cache statistics.
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple containing hits, misses, evictions, number of entries, total
+            size of the entries in bytes and number of values, which can't be
+            pickled.
+        """
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self),
+            self.nbytes,
+            self.unpicklable,
+        )
+
+
+class MemoryCache(BaseCache):
+    """ Thread-safe in-memory LRU cache with an optional byte budget and TTL.
+
+    Parameters
+    ----------
+    maxsize: int, optional
+        Maximum number of entries. Unlimited if ``None``. Default: 128.
+    max_bytes: int, optional
+        Maximum total size of the pickled entries in bytes. Unlimited if ``None``.
+        Entries larger than `max_bytes` are never stored.
+    ttl: float, optional
+        Time to live of an entry in seconds. Entries never expire if ``None``.
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None, ttl=None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def _pop(self, key):
+        data, _ = self._entries.pop(key)
+        self._nbytes -= len(data)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, expires = entry
+            if expires is not None and expires < time.monotonic():
+                self._pop(key)
+                self._count("evictions")
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def _set(self, key, data):
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (data, expires)
+            self._nbytes += len(data)
+            while (self.maxsize is not None and len(self._entries) > self.maxsize) or (
+                self.max_bytes is not None and self._nbytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+                self._count("evictions")
+
+    def clear(self):
+        """ Remove all entries from the cache. """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+
+class SQLiteCache(BaseCache):
+    """ Persistent cache stored in a SQLite database.
+    The database may be shared by multiple processes, e.g. the workers of a WSGI
+    server, and survives restarts of the app. Writes are atomic and the database
+    uses write-ahead logging, so that readers are not blocked by writers.
+
+    The callbacks of an app may share the database. The entries of each callback form
+    a `namespace`, whose keys, size and `max_bytes` limit are separate from the
+    other namespaces. Reads of valid entries don't write to the database: their
+    access times are updated in batches, before entries are evicted or once
+    `max_pending` entries were read.
+
+    Parameters
+    ----------
+    path: str
+        Path of the database file. It is created if it does not exist.
+    max_bytes: int, optional
+        Maximum total size of the pickled entries of the namespace in bytes. The
+        least recently used entries are evicted if it is exceeded. Unlimited if
+        ``None``.
+    ttl: float, optional
+        Time to live of an entry in seconds. Entries never expire if ``None``.
+    timeout: float, optional
+        Number of seconds to wait for a lock held by another process. Default: 30.
+    namespace: str, optional
+        Namespace of the entries, e.g. the id of the callback. Default: "".
+    max_pending: int, optional
+        Maximum number of pending updates of access times. Default: 100.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes=None,
+        ttl=None,
+        timeout=30.0,
+        namespace="",
+        max_pending=100,
+    ):
+        super().__init__()
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.timeout = timeout
+        self.namespace = namespace
+        self.max_pending = max_pending
+        self._local = threading.local()
+        self._accessed = {}
+        self._accessed_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dasher_cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, expires REAL, accessed REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS dasher_cache_accessed "
+                "ON dasher_cache (namespace, accessed)"
+            )
+
+    def _connection(self):
+        # connections must neither be shared between threads nor forked processes
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def __len__(self):
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM dasher_cache WHERE namespace = ?", (self.namespace,)
+        )
+        return row.fetchone()[0]
+
+    @property
+    def nbytes(self):
+        row = self._connection().execute(
+            "SELECT SUM(size) FROM dasher_cache WHERE namespace = ?", (self.namespace,)
+        )
+        return row.fetchone()[0] or 0
+
+    def _get(self, key):
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT value, expires FROM dasher_cache "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            data, expires = row
+            if expires is not None and expires < now:
+                conn.execute(
+                    "DELETE FROM dasher_cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                self._count("evictions")
+                return None
+        with self._accessed_lock:
+            self._accessed[key] = now
+            flush = len(self._accessed) >= self.max_pending
+        if flush:
+            with self._connection() as conn:
+                self._update_accessed(conn)
+        return data
+
+    def _update_accessed(self, conn):
+        with self._accessed_lock:
+            accessed, self._accessed = self._accessed, {}
+        conn.executemany(
+            "UPDATE dasher_cache SET accessed = MAX(accessed, ?) "
+            "WHERE namespace = ? AND key = ?",
+            [(t, self.namespace, key) for key, t in accessed.items()],
+        )
+
+    def _set(self, key, data):
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+        now = time.time()
+        expires = None if self.ttl is None else now + self.ttl
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO dasher_cache "
+                "(namespace, key, value, size, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, sqlite3.Binary(data), len(data), expires, now),
+            )
+            if self.max_bytes is not None:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute(
+            "SELECT SUM(size) FROM dasher_cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        if (total or 0) <= self.max_bytes:
+            return
+        # the least recently used entries are evicted by the access times of the reads
+        self._update_accessed(conn)
+        rows = conn.execute(
+            "SELECT key, size FROM dasher_cache WHERE namespace = ? ORDER BY accessed",
+            (self.namespace,),
+        )
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((self.namespace, key))
+            total -= size
+        conn.executemany(
+            "DELETE FROM dasher_cache WHERE namespace = ? AND key = ?", evicted
+        )
+        self._count("evictions", len(evicted))
+
+    def clear(self):
+        """ Remove all entries of the namespace from the cache. """
+        with self._connection() as conn:
+            conn.execute(
+                "DELETE FROM dasher_cache WHERE namespace = ?", (self.namespace,)
+            )
+
+
+_BACKENDS = {"memory": MemoryCache, "sqlite": SQLiteCache}
+
+
+def create_cache(spec, namespace=""):
+    """ Create a cache from the ``_cache`` option of a callback.
+
+    Parameters
+    ----------
+    spec: bool, dict, BaseCache or None
+        ``None`` or ``False`` disables caching, ``True`` creates a ``MemoryCache``
+        with default settings. A dictionary is passed as keyword arguments to the
+        backend selected by its optional ``"backend"`` key, which is either
+        ``"memory"`` (``MemoryCache``, default) or ``"sqlite"`` (``SQLiteCache``).
+        A ``BaseCache`` instance is used as-is.
+    namespace: str, optional
+        Default namespace of a ``SQLiteCache``, e.g. the id of the callback.
+
+    Returns
+    -------
+    BaseCache or None
+        The created cache.
+    """
+    if spec is None or spec is False:
+        return None
+    elif spec is True:
+        return MemoryCache()
+    elif isinstance(spec, BaseCache):
+        return spec
+    elif isinstance(spec, dict):
+        spec = dict(spec)
+        backend = spec.pop("backend", "memory")
+        if backend not in _BACKENDS:
+            raise ValueError(f"unknown cache backend {backend!r}")
+        if backend == "sqlite":
+            spec.setdefault("namespace", namespace)
+        return _BACKENDS[backend](**spec)
+    else:
+        raise TypeError("_cache must be a bool, dict or BaseCache instance")
+
+
+def cached(f, cache):
+    """ Wrap `f`, so that its results are memoized in `cache`.
+    The cache key is generated from the positional arguments only, keyword arguments
+    are passed through to `f`.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function.
+    cache: BaseCache
+        The cache to store the results in.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+    """
+
+    fingerprint = function_fingerprint(f)
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        key = generate_cache_key(f, args, fingerprint)
+        hit, value = cache.get(key)
+        if hit:
+            return value
+        value = f(*args, **kwargs)
+        cache.set(key, value)
+        return value
+
+    return wrapper
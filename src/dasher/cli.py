@@ -0,0 +1,60 @@
+""" Command line interface of dasher.
+
+Usage::
+
+    dasher export module:app path [--workers N] [--max-points N]
+
+The app is imported from ``module``, which is searched in the current directory, and
+``app`` is the name of the ``Dasher`` instance in the module (default: ``app``).
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+
+def load_app(spec):
+    """ Import a dasher app.
+
+    Parameters
+    ----------
+    spec: str
+        ``module:name`` of the ``Dasher`` instance. The name defaults to ``app``.
+
+    Returns
+    -------
+    dasher.Dasher
+        The app.
+    """
+    module_name, _, name = spec.partition(":")
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    module = importlib.import_module(module_name)
+    return getattr(module, name or "app")
+
+
+def main(argv=None):
+    """ Entry point of the ``dasher`` command. """
+    parser = argparse.ArgumentParser(prog="dasher")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    export = commands.add_parser("export", help="export an app to a static site")
+    export.add_argument("app", help="module:name of the Dasher instance")
+    export.add_argument("path", help="output directory")
+    export.add_argument("--workers", type=int, default=None)
+    export.add_argument("--max-points", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    app = load_app(args.app)
+    info = app.export(args.path, workers=args.workers, max_points=args.max_points)
+    print(
+        f"exported {info.results} results and {info.assets} assets to {args.path} "
+        f"({info.empty} empty, {info.failed} failed)"
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,427 @@
+""" Downsampling of large figures returned by callbacks.
+
+A callback decorated with the ``_downsample`` option post-processes its output: traces
+of ``dcc.Graph`` figures with more than `max_points` points are replaced by a
+downsampled version, using the largest-triangle-three-buckets (LTTB) algorithm or the
+minimum and maximum of each bucket.
+
+The full-resolution traces are kept in memory for a limited number of figures. When
+the user zooms into a graph, its ``relayoutData`` triggers a callback, which
+downsamples the visible window of the full-resolution traces again. Graphs receive a
+pattern-matching id for this purpose, unless they have an id already. If the traces
+of a graph are not in memory, e.g. because the output was served from a persistent
+cache or by another worker process, the callback function is called again with the
+current values of the widgets.
+
+Only line and scatter traces with numeric or datetime ``x`` values in ascending
+order and numeric ``y`` values are downsampled. Requires ``numpy``.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import wraps
+
+import dash_core_components as dcc
+from dash.dependencies import MATCH
+from dash.dependencies import Input
+from dash.dependencies import Output
+from dash.dependencies import State
+from dash.development.base_component import Component
+from dash.exceptions import PreventUpdate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def lttb(x, y, n):
+    """ Select `n` points of a line using the largest-triangle-three-buckets algorithm,
+    which preserves the visual shape of the line.
+
+    Parameters
+    ----------
+    x: numpy.ndarray
+        Ascending x values.
+    y: numpy.ndarray
+        y values.
+    n: int
+        Number of points to select.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indexes of the selected points.
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = x.astype(float)
+    y = y.astype(float)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    indexes = np.empty(n, dtype=np.intp)
+    indexes[0] = a = 0
+    indexes[-1] = size - 1
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < n - 1 else size
+        # the third vertex is the average of the next bucket
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indexes[i + 1] = a
+    return indexes
+
+
+def minmax(x, y, n):
+    """ Select the points with the minimum and maximum `y` value in each of `n / 2`
+    buckets, which preserves the extrema of the line.
+
+    Parameters
+    ----------
+    x: numpy.ndarray
+        Ascending x values.
+    y: numpy.ndarray
+        y values.
+    n: int
+        Maximum number of points to select.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indexes of the selected points.
+    """
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    buckets = max((n - 2) // 2, 1)
+    width = -(-size // buckets)
+    padded = np.full(buckets * width, np.nan)
+    padded[:size] = y
+    padded = padded.reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    selected = np.concatenate(
+        (
+            [0, size - 1],
+            offsets + np.nanargmin(padded, axis=1),
+            offsets + np.nanargmax(padded, axis=1),
+        )
+    )
+    return np.unique(selected)
+
+
+_METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+def _trace_dict(trace):
+    if not hasattr(trace, "to_plotly_json"):
+        return dict(trace)
+    # recent plotly versions encode arrays as base64 in to_plotly_json
+    data = trace.to_plotly_json()
+    for key in ("x", "y"):
+        if key in data:
+            data[key] = trace[key]
+    return data
+
+
+def _figure_dict(figure):
+    if hasattr(figure, "to_plotly_json"):
+        figure = {"data": figure.data, "layout": figure.layout.to_plotly_json()}
+    figure = dict(figure)
+    figure["data"] = [_trace_dict(t) for t in figure.get("data", [])]
+    figure["layout"] = dict(figure.get("layout", {}) or {})
+    return figure
+
+
+def _xy(trace):
+    if trace.get("type", "scatter") not in ("scatter", "scattergl"):
+        return None
+    if trace.get("y") is None:
+        return None
+    y = np.asarray(trace["y"])
+    if y.ndim != 1 or y.dtype.kind not in "iuf":
+        return None
+    x = np.arange(len(y)) if trace.get("x") is None else np.asarray(trace["x"])
+    if x.shape != y.shape or x.dtype.kind not in "iufM":
+        return None
+    if len(x) > 1 and np.any(x[1:] < x[:-1]):
+        return None
+    return x, y
+
+
+class Downsampler(object):
+    """ Downsamples the figures of the output of a callback.
+
+    Parameters
+    ----------
+    max_points: int, optional
+        Maximum number of points of a trace. Default: 2000.
+    method: str, optional
+        ``"lttb"`` (largest-triangle-three-buckets) or ``"minmax"`` (minimum and
+        maximum per bucket). Default: "lttb".
+    max_figures: int, optional
+        Number of figures, whose full-resolution traces are kept in memory for
+        zooming. Default: 32.
+    """
+
+    graph_type = "dasher-graph"
+
+    def __init__(self, max_points=2000, method="lttb", max_figures=32):
+        if np is None:
+            raise ImportError("downsampling requires numpy")
+        if method not in _METHODS:
+            raise ValueError(f"unknown downsampling method {method!r}")
+        self.max_points = max_points
+        self.method = method
+        self.max_figures = max_figures
+        self.figures = OrderedDict()
+        self.functions = {}
+        self._lock = threading.Lock()
+
+    def reduce(self, x, y):
+        """ Downsample the trace `x`, `y` to at most `max_points` points. """
+        indexes = _METHODS[self.method](x, y, self.max_points)
+        return x[indexes], y[indexes]
+
+    def downsample_figure(self, figure):
+        """ Downsample the traces of a figure.
+
+        Parameters
+        ----------
+        figure: dict or plotly.graph_objects.Figure
+            The figure.
+
+        Returns
+        -------
+        figure: dict
+            The downsampled figure.
+        full: dict
+            Full-resolution ``(x, y)`` of the downsampled traces by trace index.
+        """
+        figure = _figure_dict(figure)
+        full = {}
+        for i, trace in enumerate(figure["data"]):
+            xy = _xy(trace)
+            if xy is None or len(xy[0]) <= self.max_points:
+                continue
+            full[i] = xy
+            trace["x"], trace["y"] = self.reduce(*xy)
+        return figure, full
+
+    def process(self, output, callback_id):
+        """ Downsample the figures of all graphs in the output of a callback.
+
+        Parameters
+        ----------
+        output: object
+            Output of the callback function, e.g. a list of components.
+        callback_id: str
+            Id of the callback.
+
+        Returns
+        -------
+        object
+            The output with downsampled figures.
+        """
+        return self._process(output, callback_id, [])
+
+    def _process(self, output, callback_id, graphs):
+        # graphs collects the full-resolution traces of the zoomable graphs in order
+        if isinstance(output, (list, tuple)):
+            return type(output)(self._process(o, callback_id, graphs) for o in output)
+        if isinstance(output, dcc.Graph):
+            self._process_graph(output, callback_id, graphs)
+        elif isinstance(output, Component):
+            children = getattr(output, "children", None)
+            if children is not None:
+                output.children = self._process(children, callback_id, graphs)
+        return output
+
+    def _process_graph(self, graph, callback_id, graphs):
+        figure = getattr(graph, "figure", None)
+        if figure is None:
+            return
+        figure, full = self.downsample_figure(figure)
+        if not full:
+            return
+        graph.figure = figure
+        if getattr(graph, "id", None) is None:
+            # the position identifies the graph in the output of a repeated call
+            token = f"{uuid.uuid4().hex}-{len(graphs)}"
+            graph.id = {
+                "type": self.graph_type,
+                "callback": callback_id,
+                "index": token,
+            }
+            graphs.append(full)
+            self._store(token, full)
+
+    def _store(self, token, full):
+        with self._lock:
+            self.figures[token] = full
+            self.figures.move_to_end(token)
+            while len(self.figures) > self.max_figures:
+                self.figures.popitem(last=False)
+
+    def _full(self, graph_id, values):
+        """ Full-resolution traces of a graph, which are computed again by calling
+        the function of the callback with the widget `values` if they are missing.
+        """
+        token = graph_id["index"]
+        with self._lock:
+            full = self.figures.get(token)
+        if full is not None:
+            return full
+        f = self.functions.get(graph_id["callback"])
+        if f is None:
+            return None
+        graphs = []
+        self._process(f(*values), graph_id["callback"], graphs)
+        position = int(token.rsplit("-", 1)[-1])
+        if position >= len(graphs):
+            return None
+        self._store(token, graphs[position])
+        return graphs[position]
+
+    def zoom(self, relayout, graph_id, figure, *values):
+        """ Callback downsampling the visible window of the full-resolution traces of
+        a graph after the user zoomed.
+
+        Parameters
+        ----------
+        relayout: dict
+            ``relayoutData`` of the graph.
+        graph_id: dict
+            Id of the graph.
+        figure: dict
+            Current figure of the graph.
+        *values:
+            Values of the widgets of the callback, which are passed to its function
+            registered in `functions` if the full-resolution traces are missing.
+
+        Returns
+        -------
+        dict
+            Figure with the traces downsampled in the visible window.
+        """
+        if not relayout or figure is None:
+            raise PreventUpdate
+        if "xaxis.range[0]" in relayout:
+            window = [relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]]
+        elif "xaxis.range" in relayout:
+            window = list(relayout["xaxis.range"])
+        elif relayout.get("xaxis.autorange"):
+            window = None
+        else:
+            raise PreventUpdate
+        full = self._full(graph_id, values)
+        if full is None:
+            raise PreventUpdate
+
+        for i, (x, y) in full.items():
+            if window is not None:
+                dtype = x.dtype if x.dtype.kind == "M" else float
+                bounds = np.array(window, dtype=dtype)
+                start = max(np.searchsorted(x, bounds[0], "left") - 1, 0)
+                end = np.searchsorted(x, bounds[1], "right") + 1
+                x, y = x[start:end], y[start:end]
+            figure["data"][i]["x"], figure["data"][i]["y"] = self.reduce(x, y)
+
+        layout = figure.setdefault("layout", {})
+        xaxis = dict(layout.get("xaxis", {}) or {})
+        if window is None:
+            xaxis.pop("range", None)
+            xaxis["autorange"] = True
+        else:
+            xaxis["range"] = window
+            xaxis["autorange"] = False
+        layout["xaxis"] = xaxis
+        if "yaxis.range[0]" in relayout:
+            yaxis = dict(layout.get("yaxis", {}) or {})
+            yaxis["range"] = [relayout["yaxis.range[0]"], relayout["yaxis.range[1]"]]
+            yaxis["autorange"] = False
+            layout["yaxis"] = yaxis
+        return figure
+
+    def register_callbacks(self, app, callback_id, states=()):
+        """ Register the zoom callback for the graphs of a callback.
+
+        Parameters
+        ----------
+        app: dash.Dash
+            The dash app.
+        callback_id: str
+            Id of the callback.
+        states: list of dash.dependencies.State, optional
+            States of the widgets of the callback, whose values are passed to the
+            function of the callback in `functions` if the full-resolution traces
+            of a graph are missing.
+        """
+        graph = {"type": self.graph_type, "callback": callback_id, "index": MATCH}
+        app.callback(
+            Output(graph, "figure"),
+            [Input(graph, "relayoutData")],
+            [State(graph, "id"), State(graph, "figure")] + list(states),
+            prevent_initial_call=True,
+        )(self.zoom)
+
+
+def create_downsampler(spec):
+    """ Create a downsampler from the ``_downsample`` option of a callback.
+
+    Parameters
+    ----------
+    spec: bool, int, dict, Downsampler or None
+        ``None`` or ``False`` disables downsampling, ``True`` creates a
+        ``Downsampler`` with default settings and an integer is used as its
+        `max_points`. A dictionary is passed as keyword arguments to
+        ``Downsampler`` and a ``Downsampler`` instance is used as-is.
+
+    Returns
+    -------
+    Downsampler or None
+        The created downsampler.
+    """
+    if spec is None or spec is False:
+        return None
+    elif spec is True:
+        return Downsampler()
+    elif isinstance(spec, Downsampler):
+        return spec
+    elif isinstance(spec, int):
+        return Downsampler(max_points=spec)
+    elif isinstance(spec, Mapping):
+        return Downsampler(**spec)
+    else:
+        raise TypeError("_downsample must be a bool, int, dict or Downsampler")
+
+
+def downsampled(f, downsampler, callback_id):
+    """ Wrap `f`, so that the figures in its output are downsampled.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function.
+    downsampler: Downsampler
+        The downsampler.
+    callback_id: str
+        Id of the callback.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return downsampler.process(f(*args, **kwargs), callback_id)
+
+    return wrapper
@@ -0,0 +1,110 @@
+""" Fast encoding of callback responses.
+
+By default, dash encodes the responses of callbacks using ``json.dumps`` with the
+``PlotlyJSONEncoder``, which calls back into Python for every component, figure and
+array and writes arrays as decimal text. If the app is created with ``encoding_kw``,
+the responses of the dasher callbacks are encoded by an ``Encoder`` using ``orjson``
+instead, which serializes NumPy arrays natively.
+
+The encoder replaces the response serialization of the dash callback wrapper of dash
+1.x, whose layout it relies on, so that the encoder raises a ``RuntimeError`` with
+later versions of dash. Requires the ``orjson`` package (``pip install dasher[fast]``).
+"""
+
+from collections.abc import Mapping
+from functools import wraps
+
+import dash
+from dash import no_update
+from dash.exceptions import CallbackException
+from dash.exceptions import InvalidCallbackReturnValue
+from dash.exceptions import PreventUpdate
+from plotly.utils import PlotlyJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class Encoder(object):
+    """ Encodes callback responses using ``orjson``. Raises a ``RuntimeError`` with
+    dash 2 or later, whose callback wrapper is not supported by ``install``.
+    """
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("fast encoding requires the orjson package")
+        if int(dash.__version__.split(".")[0]) >= 2:
+            raise RuntimeError(
+                f"fast encoding requires dash 1.x, but dash {dash.__version__} is "
+                "installed"
+            )
+        self.option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        self._plotly = PlotlyJSONEncoder()
+
+    def default(self, obj):
+        """ Convert objects, which are not serialized by ``orjson``, e.g. components
+        and plotly figures.
+        """
+        if hasattr(obj, "to_plotly_json"):
+            return obj.to_plotly_json()
+        return self._plotly.default(obj)
+
+    def dumps(self, obj):
+        """ Encode `obj` as JSON.
+
+        Parameters
+        ----------
+        obj: object
+            The object, e.g. a list of dash components.
+
+        Returns
+        -------
+        bytes
+            The JSON encoding of `obj`.
+        """
+        return orjson.dumps(obj, default=self.default, option=self.option)
+
+    def install(self, app, output):
+        """ Encode the responses of a registered dash callback with this encoder.
+
+        The response serialization of the callback wrapper of dash is replaced, i.e.
+        the function registered in ``app.callback_map`` is called with the same
+        arguments and the response is built in the format of dash 1.x. The output
+        specification of the request and the serializability of the return value
+        are validated like dash does, raising the exceptions of ``dash.exceptions``.
+
+        Parameters
+        ----------
+        app: dash.Dash
+            The dash app.
+        output: dash.dependencies.Output
+            The single output of the callback, whose id is a string.
+        """
+        f = app.callback_map[str(output)]["callback"].__wrapped__
+        id = output.component_id
+        prop = output.component_property
+
+        @wraps(f)
+        def dispatch(*args, outputs_list):
+            if (
+                not isinstance(outputs_list, Mapping)
+                or outputs_list.get("id") != id
+                or outputs_list.get("property") != prop
+            ):
+                raise CallbackException(
+                    f"output specification {outputs_list!r} does not match {output}"
+                )
+            value = f(*args)
+            if value is no_update:
+                raise PreventUpdate
+            try:
+                return self.dumps({"response": {id: {prop: value}}, "multi": True})
+            except orjson.JSONEncodeError as e:
+                raise InvalidCallbackReturnValue(
+                    f"the callback for {output} returned a value, which is not JSON "
+                    f"serializable: {e}"
+                )
+
+        app.callback_map[str(output)]["callback"] = dispatch
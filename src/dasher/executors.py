@@ -0,0 +1,313 @@
+""" Execution of CPU-bound callbacks in a process pool.
+
+A callback decorated with ``_executor="process"`` is not executed in the request
+thread, but in a worker process of a ``ProcessPoolExecutor``. This allows callbacks
+holding the GIL to run on multiple cores without blocking the other requests.
+
+The callback function is sent to the worker processes by reference (module, qualified
+name and id of the function). Workers forked from the app process find it in the
+registry of this module, other workers import the module of the function, which
+registers it again.
+"""
+
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError
+from functools import wraps
+
+_functions = {}
+
+# ProcessPoolExecutor replaces single workers after max_tasks_per_child since 3.11
+_NATIVE_RECYCLING = sys.version_info >= (3, 11)
+
+
+class FunctionReference(object):
+    """ Picklable reference to a callback function, which is resolved in the worker
+    process.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function. It is added to the registry of this module.
+    qualname: str, optional
+        Name of the function in the registry, which tells apart several wrappers of
+        the same callback function. Default: the qualified name of `f`.
+    """
+
+    def __init__(self, f, qualname=None):
+        self.module = f.__module__
+        self.qualname = qualname if qualname is not None else f.__qualname__
+        # local functions of the same qualified name are told apart by their id
+        self.id = id(f)
+        _functions[(self.module, self.qualname, self.id)] = f
+
+    def __getstate__(self):
+        return {"module": self.module, "qualname": self.qualname, "id": self.id}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def resolve(self):
+        """ Return the referenced function, importing its module if necessary.
+
+        Workers, which are not forked from the app process, register the functions
+        again with different ids when importing the module. The function is then
+        found by its unique qualified name. A ``LookupError`` is raised if it is not
+        registered, e.g. because importing the module does not register it.
+        """
+        key = (self.module, self.qualname, self.id)
+        if key in _functions:
+            return _functions[key]
+        importlib.import_module(self.module)
+        if key in _functions:
+            return _functions[key]
+        # the main module of the app is imported as __mp_main__ by spawned workers
+        modules = {self.module}
+        if self.module == "__main__":
+            modules.add("__mp_main__")
+        name = f"{self.module}.{self.qualname}"
+        candidates = [
+            f
+            for (module_name, qualname, _), f in list(_functions.items())
+            if module_name in modules and qualname == self.qualname
+        ]
+        if len(candidates) > 1:
+            raise LookupError(f"callback {name} is ambiguous")
+        if not candidates:
+            raise LookupError(
+                f"callback {name} is not registered in the worker process, importing "
+                f"its module {self.module!r} must register it"
+            )
+        return candidates[0]
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+
+def _terminate(pool):
+    # ProcessPoolExecutor has no public API to stop busy workers
+    for process in list(getattr(pool, "_processes", {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False)
+
+
+class ProcessExecutor(object):
+    """ Runs callback functions in a pool of worker processes.
+
+    The pool is created lazily in each process. Worker processes are recycled after
+    `max_tasks_per_child` calls to limit the impact of memory leaks. A call exceeding
+    `timeout` retires the pool: new calls are submitted to a new pool and the workers
+    of the retired pool are terminated once its other calls have finished.
+
+    Parameters
+    ----------
+    max_workers: int, optional
+        Number of worker processes. Default: number of CPUs.
+    timeout: float, optional
+        Maximum number of seconds a call may take. A ``TimeoutError`` is raised if
+        it is exceeded. Unlimited if ``None``.
+    max_tasks_per_child: int, optional
+        Number of calls after which a worker process is replaced by a new one. Since
+        Python 3.11, workers are replaced individually by the pool, which starts
+        them using the "spawn" method unless another method than "fork" is given by
+        `mp_context`, so that the callback functions must be importable. With older
+        versions of Python or the "fork" method, the whole pool is replaced after
+        `max_tasks_per_child` calls in total. Never recycled if ``None``.
+    mp_context: str, optional
+        Multiprocessing start method, e.g. "fork" or "spawn". Default: the default
+        start method of the platform.
+
+    Attributes
+    ----------
+    calls: int
+        Number of calls submitted to the current pool.
+    recycled: int
+        Number of times the pool has been replaced.
+    """
+
+    def __init__(
+        self, max_workers=None, timeout=None, max_tasks_per_child=None, mp_context=None
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.mp_context = mp_context
+        self.calls = 0
+        self.recycled = 0
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # pending futures of the pools and timed out futures of retired pools
+        self._pending = {}
+        self._retired = {}
+
+    @property
+    def native_recycling(self):
+        """ True if the workers are recycled individually by the pool. """
+        return (
+            _NATIVE_RECYCLING
+            and self.max_tasks_per_child is not None
+            and self.mp_context != "fork"
+        )
+
+    def _create_pool(self):
+        context = None
+        if self.mp_context is not None:
+            context = multiprocessing.get_context(self.mp_context)
+        if self.native_recycling:
+            return ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=context,
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return ProcessPoolExecutor(self.max_workers, mp_context=context)
+
+    def _submit(self, f, args, kwargs):
+        with self._lock:
+            if self._pid != os.getpid():
+                # the pools of the parent of a forked process are not usable
+                self._pool = None
+                self._pending = {}
+                self._retired = {}
+            if self._pool is not None:
+                if (
+                    self.native_recycling
+                    or self.max_tasks_per_child is None
+                    or self.calls < self.max_tasks_per_child
+                ):
+                    self.calls += 1
+                else:
+                    # running calls of the old pool finish before its workers exit
+                    self._pool.shutdown(wait=False)
+                    self._pool = None
+                    self.recycled += 1
+            if self._pool is None:
+                self._pool = self._create_pool()
+                self._pid = os.getpid()
+                self.calls = 1
+            pool = self._pool
+            future = pool.submit(f, *args, **kwargs)
+            self._pending.setdefault(pool, set()).add(future)
+        future.add_done_callback(lambda future: self._discard(pool, future))
+        return pool, future
+
+    def _discard(self, pool, future):
+        with self._lock:
+            pending = self._pending.get(pool, set())
+            pending.discard(future)
+            if not pending and pool is not self._pool and pool not in self._retired:
+                self._pending.pop(pool, None)
+        self._terminate_retired(pool)
+
+    def _retire(self, pool, future):
+        # cancels the call if it has not started yet
+        future.cancel()
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self.recycled += 1
+            self._retired.setdefault(pool, set()).add(future)
+        self._terminate_retired(pool)
+
+    def _terminate_retired(self, pool):
+        # the workers of a retired pool are terminated once only calls exceeding the
+        # timeout are left, so that other calls are not interrupted
+        with self._lock:
+            timed_out = self._retired.get(pool)
+            if timed_out is None or not self._pending.get(pool, set()) <= timed_out:
+                return
+            del self._retired[pool]
+            self._pending.pop(pool, None)
+        _terminate(pool)
+
+    def run(self, f, args=(), kwargs=None):
+        """ Call `f` in a worker process and wait for its result.
+
+        Parameters
+        ----------
+        f: FunctionReference or callable
+            The function to call. It must be picklable.
+        args: tuple, optional
+            Positional arguments of the call.
+        kwargs: dict, optional
+            Keyword arguments of the call.
+
+        Returns
+        -------
+        object
+            The return value of the call.
+        """
+        pool, future = self._submit(f, args, kwargs if kwargs is not None else {})
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            self._retire(pool, future)
+            raise TimeoutError(f"callback exceeded the timeout of {self.timeout}s")
+
+    def shutdown(self, wait=True):
+        """ Shut down the pool of worker processes. The workers of pools retired
+        after a timeout are terminated.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            retired, self._retired = list(self._retired), {}
+            self._pending = {}
+        for retired_pool in retired:
+            _terminate(retired_pool)
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+def executed(f, executor):
+    """ Wrap `f`, so that it is executed by `executor`.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function. It must be importable from its module, or defined
+        before the worker processes are forked.
+    executor: ProcessExecutor
+        The executor.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+    """
+    reference = FunctionReference(f)
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return executor.run(reference, args, kwargs)
+
+    return wrapper
+
+
+def create_executor(spec, default):
+    """ Create an executor from the ``_executor`` option of a callback.
+
+    Parameters
+    ----------
+    spec: str, ProcessExecutor or None
+        ``None`` executes the callback in the request thread. ``"process"`` uses the
+        `default` executor and a ``ProcessExecutor`` instance is used as-is.
+    default: ProcessExecutor
+        The default process executor of the app.
+
+    Returns
+    -------
+    ProcessExecutor or None
+        The executor.
+    """
+    if spec is None:
+        return None
+    elif isinstance(spec, ProcessExecutor):
+        return spec
+    elif spec == "process":
+        return default
+    else:
+        raise ValueError("_executor must be None, 'process' or a ProcessExecutor")
@@ -0,0 +1,316 @@
+""" Static export of dasher apps.
+
+If every widget of every callback has a finite ``domain``, the app can be exported to
+a self-contained static site, which is served by any static file server without
+Python workers. The export evaluates the callback requests of every tab and every
+combination of widget values in a process pool and writes the responses as JSON
+files, along with the index page and the JavaScript bundles of the app.
+
+A small shim injected into the index page replaces the requests of dash to the
+server: it looks up the response file of a callback request by the values of its
+inputs and states. Requests without a result, e.g. the search of large dropdowns,
+do not update the page.
+
+The site uses the ``requests_pathname_prefix`` of the dash app, i.e. it must be served
+at the root of a domain by default.
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from .precompute import grid_points
+from .precompute import parameter_grid
+
+ExportInfo = namedtuple("ExportInfo", ["results", "empty", "failed", "assets"])
+""" Statistics of an export, as returned by ``export``. """
+
+_SHIM = """
+(function() {
+    var base = "%(prefix)s_dasher/export/";
+    var fetch = window.fetch.bind(window);
+    var files = {};
+    function load(url) {
+        if (!(url in files)) {
+            files[url] = fetch(url).then(function(r) { return r.ok ? r.json() : {}; });
+        }
+        return files[url];
+    }
+    function values(dependencies) {
+        return (dependencies || []).map(function(d) {
+            return Array.isArray(d) ? values(d) : d.value;
+        });
+    }
+    window.fetch = function(url, options) {
+        var path = String(url).split("?")[0];
+        if (/_dash-(layout|dependencies)$/.test(path)) {
+            return fetch(path + ".json", options);
+        }
+        if (!/_dash-update-component$/.test(path)) {
+            return fetch(url, options);
+        }
+        var body = JSON.parse(options.body);
+        return load(base + "index.json").then(function(index) {
+            var callback = index[body.output];
+            if (!callback) {
+                return undefined;
+            }
+            return load(base + callback.index).then(function(results) {
+                var args = values(body.inputs).concat(values(body.state));
+                return results[JSON.stringify(args.slice(callback.skip))];
+            });
+        }).then(function(file) {
+            if (file === undefined) {
+                return new Response(null, {status: 204});
+            }
+            return fetch(base + file);
+        });
+    };
+})();
+"""
+
+_app = None  # the app whose requests are dispatched, inherited by forked workers
+
+
+def _js_number(x):
+    """ Format the float `x` like ``Number.prototype.toString`` of JavaScript, e.g.
+    ``1e-7`` instead of ``1e-07`` and ``0.00001`` instead of ``1e-05``.
+    """
+    if not math.isfinite(x):
+        return "null"
+    if x == 0:
+        return "0"
+    sign = "-" if x < 0 else ""
+    # repr and JavaScript both use the shortest digits, which round-trip
+    _, digits, exponent = Decimal(repr(abs(x))).normalize().as_tuple()
+    digits = "".join(map(str, digits))
+    k = len(digits)
+    n = k + exponent
+    if k <= n <= 21:
+        text = digits + "0" * (n - k)
+    elif 0 < n <= 21:
+        text = f"{digits[:n]}.{digits[n:]}"
+    elif -6 < n <= 0:
+        text = f"0.{'0' * -n}{digits}"
+    else:
+        mantissa = digits if k == 1 else f"{digits[0]}.{digits[1:]}"
+        text = f"{mantissa}e{'+' if n > 0 else '-'}{abs(n - 1)}"
+    return sign + text
+
+
+def _stringify(value):
+    # encodes like JSON.stringify in the browser, which differs in floats
+    if isinstance(value, float):
+        return _js_number(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_stringify(v) for v in value) + "]"
+    if isinstance(value, dict):
+        items = (
+            f"{json.dumps(str(k), ensure_ascii=False)}:{_stringify(v)}"
+            for k, v in value.items()
+        )
+        return "{" + ",".join(items) + "}"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _key(values):
+    # matches JSON.stringify in the shim
+    return _stringify(list(values))
+
+
+def _body(callback_output, output, inputs, states=()):
+    def dependency(d, value):
+        return {"id": d.component_id, "property": d.component_property, "value": value}
+
+    return {
+        "output": str(callback_output),
+        "outputs": {"id": output.component_id, "property": output.component_property},
+        "inputs": [dependency(d, value) for d, value in inputs],
+        "state": [dependency(d, value) for d, value in states],
+        "changedPropIds": [],
+    }
+
+
+def export_requests(app, max_points=None):
+    """ Yield the callback requests of a static export.
+
+    Parameters
+    ----------
+    app: dasher.Dasher
+        The dasher app.
+    max_points: int, optional
+        Maximum number of widget value combinations per callback. Larger grids are
+        sampled. Unlimited if ``None``.
+
+    Yields
+    ------
+    skip: int
+        Number of leading input values, which are not part of the lookup key, e.g.
+        the clicks of the submit button.
+    body: dict
+        Body of the request to ``_dash-update-component``.
+    """
+    for callback_output, output, inputs in app.api.layout.export_requests():
+        yield 0, _body(callback_output, output, inputs)
+
+    for callback in app.callbacks.values():
+        if callback.background is not None:
+            raise ValueError(f"background callback {callback.name!r} can't be exported")
+        domains = parameter_grid(callback.widgets)
+        output = callback.outputs
+        for point in grid_points(domains, max_points):
+            if callback.submit == "submit":
+                trigger = [(d, 1) for d in callback.inputs]
+                values = list(zip(callback.states, point))
+                yield len(trigger), _body(output, output, trigger, values)
+            else:
+                yield 0, _body(output, output, list(zip(callback.inputs, point)))
+
+
+def _dispatch(body):
+    client = _app.get_flask_server().test_client()
+    prefix = _app.app.config.routes_pathname_prefix
+    response = client.post(f"{prefix}_dash-update-component", json=body)
+    return response.status_code, response.get_data()
+
+
+def _write(path, url, data):
+    filename = os.path.join(path, *url.strip("/").split("/"))
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "wb") as fh:
+        fh.write(data)
+
+
+def _fingerprinted(url, fingerprint):
+    directory, filename = url.rsplit("/", 1)
+    name, extension = filename.split(".", 1)
+    return f"{directory}/{name}.{fingerprint}.{extension}"
+
+
+def _export_assets(app, path):
+    dash_app = app.app
+    client = app.get_flask_server().test_client()
+    routes_prefix = dash_app.config.routes_pathname_prefix
+    prefix = dash_app.config.requests_pathname_prefix
+
+    index = client.get(routes_prefix).get_data(as_text=True)
+    urls = {}
+    for url in re.findall(r'(?:src|href)="([^"]+)"', index):
+        if url.startswith(prefix) and not url.startswith("//"):
+            url = url.split("?")[0]
+            urls[url] = routes_prefix + url[len(prefix) :]
+
+    # chunks loaded on demand, e.g. the slider of dash_core_components, are
+    # requested with the fingerprint of the bundle of their package
+    for namespace, paths in dash_app.registered_paths.items():
+        suite = f"{prefix}_dash-component-suites/{namespace}/"
+        pattern = re.escape(suite) + r'[^"]*?\.(v[\w]+m\d+)\.'
+        fingerprints = set(re.findall(pattern, index))
+        for relative_path in paths:
+            if relative_path.endswith(".map"):
+                continue
+            url = suite + relative_path
+            route = routes_prefix + url[len(prefix) :]
+            urls.setdefault(url, route)
+            for fingerprint in fingerprints:
+                urls.setdefault(_fingerprinted(url, fingerprint), route)
+
+    for name in ("_dash-layout", "_dash-dependencies"):
+        urls[f"{prefix}{name}.json"] = f"{routes_prefix}{name}"
+
+    assets = 0
+    for url, route in urls.items():
+        response = client.get(route)
+        if response.status_code == 200:
+            _write(path, url, response.get_data())
+            assets += 1
+
+    shim = '<script type="application/javascript">%s</script>\n' % (
+        _SHIM % {"prefix": prefix}
+    )
+    position = index.index("<script")
+    index = index[:position] + shim + index[position:]
+    _write(path, f"{prefix}index.html", index.encode("utf-8"))
+    return assets + 1
+
+
+def export(app, path, workers=None, max_points=None):
+    """ Export `app` to a static site in the directory `path`.
+
+    Parameters
+    ----------
+    app: dasher.Dasher
+        The dasher app. All widgets of its callbacks must have a finite ``domain``
+        and background callbacks are not supported.
+    path: str
+        Output directory. It is created if it does not exist.
+    workers: int, optional
+        Number of worker processes, which are forked from the calling process. If 0
+        or if forking is not supported, the requests are evaluated in the calling
+        process. Default: number of CPUs.
+    max_points: int, optional
+        Maximum number of widget value combinations per callback. Larger grids are
+        sampled, the other combinations do not update the page. Unlimited if
+        ``None``.
+
+    Returns
+    -------
+    ExportInfo
+        Named tuple containing the number of written results, empty results (e.g.
+        ``PreventUpdate``), failed requests and exported assets.
+    """
+    global _app
+
+    requests = list(export_requests(app, max_points))
+    results_path = os.path.join(path, "_dasher", "export")
+    os.makedirs(results_path, exist_ok=True)
+
+    _app = app
+    pool = None
+    try:
+        if workers != 0 and "fork" in multiprocessing.get_all_start_methods():
+            workers = workers or os.cpu_count() or 1
+            pool = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("fork")
+            )
+            chunksize = max(1, len(requests) // (4 * workers))
+            bodies = [body for _, body in requests]
+            responses = pool.map(_dispatch, bodies, chunksize=chunksize)
+        else:
+            responses = map(_dispatch, [body for _, body in requests])
+
+        callbacks = {}
+        counts = {"results": 0, "empty": 0, "failed": 0}
+        for i, ((skip, body), (status, data)) in enumerate(zip(requests, responses)):
+            if body["output"] not in callbacks:
+                callbacks[body["output"]] = {"skip": skip, "results": {}}
+            if status == 204:
+                counts["empty"] += 1
+                continue
+            elif status != 200:
+                counts["failed"] += 1
+                continue
+            values = [d["value"] for d in body["inputs"] + body["state"]]
+            filename = f"r{i}.json"
+            callbacks[body["output"]]["results"][_key(values[skip:])] = filename
+            _write(results_path, filename, data)
+            counts["results"] += 1
+    finally:
+        _app = None
+        if pool is not None:
+            pool.shutdown()
+
+    index = {}
+    for i, (output, callback) in enumerate(callbacks.items()):
+        filename = f"c{i}.json"
+        _write(results_path, filename, json.dumps(callback["results"]).encode("utf-8"))
+        index[output] = {"index": filename, "skip": callback["skip"]}
+    _write(results_path, "index.json", json.dumps(index).encode("utf-8"))
+
+    assets = _export_assets(app, path)
+    return ExportInfo(assets=assets, **counts)
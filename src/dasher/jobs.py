@@ -0,0 +1,334 @@
+""" Background execution of long-running callbacks.
+
+A callback decorated with ``_background=True`` does not block the request thread.
+Instead, the callback function is submitted to a local thread pool and the tab polls
+for the result using a ``dcc.Interval``. A newer request from the same browser session
+cancels the job it replaces.
+
+Callback functions written as generators run in the background as well. Every
+yielded value is published as a partial result, which is displayed by the next poll
+of the tab, e.g. a coarse figure before the refined one. The last yielded value is
+the final result.
+
+The jobs are kept in the memory of the process, which started them, so that the app
+must be served by a single process, e.g. a threaded server with one worker process.
+The id of a job contains the id of its process: a poll, which is handled by another
+process, e.g. a second worker of a WSGI server, is answered with an explicit error
+instead of polling forever.
+"""
+
+import inspect
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+
+class JobCancelled(Exception):
+    """ Raised by ``Progress`` if the job has been cancelled. """
+
+    pass
+
+
+class Progress(object):
+    """ Progress reporting handle, which is passed to a background callback function
+    as its ``_progress`` keyword argument.
+
+    Calling the handle reports progress. It raises ``JobCancelled`` if the job was
+    cancelled in the meantime, which stops the execution of the callback function.
+
+    Attributes
+    ----------
+    value: float or None
+        Current progress value.
+    total: float or None
+        Value corresponding to completion.
+    message: str or None
+        Progress message.
+    result: object
+        Latest partial result published by a generator callback.
+    published: int
+        Number of published partial results.
+    """
+
+    def __init__(self):
+        self.value = None
+        self.total = None
+        self.message = None
+        self.result = None
+        self.published = 0
+        self._cancelled = threading.Event()
+
+    def __call__(self, value=None, total=None, message=None):
+        """ Report progress.
+
+        Parameters
+        ----------
+        value: float, optional
+            Current progress value.
+        total: float, optional
+            Value corresponding to completion.
+        message: str, optional
+            Progress message.
+        """
+        self.value = value
+        if total is not None:
+            self.total = total
+        self.message = message
+        if self.cancelled:
+            raise JobCancelled()
+
+    def publish(self, result):
+        """ Publish a partial result, which is displayed until the next partial or
+        the final result is available.
+
+        Parameters
+        ----------
+        result: object
+            The partial result, e.g. a list of dash components.
+        """
+        self.result = result
+        self.published += 1
+        if self.cancelled:
+            raise JobCancelled()
+
+    @property
+    def cancelled(self):
+        """ True if the job has been cancelled. """
+        return self._cancelled.is_set()
+
+    @property
+    def fraction(self):
+        """ Progress as a fraction between 0 and 1 or ``None`` if unknown. """
+        if self.value is None or not self.total:
+            return None
+        return min(max(self.value / self.total, 0.0), 1.0)
+
+    def cancel(self):
+        """ Request cancellation of the job. """
+        self._cancelled.set()
+
+    def __getstate__(self):
+        # a handle sent to a worker process does not report back
+        state = self.__dict__.copy()
+        del state["_cancelled"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cancelled = threading.Event()
+
+
+class Job(object):
+    """ A callback function call running in the background.
+
+    Attributes
+    ----------
+    id: str
+        Unique id of the job.
+    future: concurrent.futures.Future
+        Future of the function call.
+    progress: Progress
+        Progress reporting handle of the job.
+    sent: int
+        Number of partial results published when the last one was sent to the
+        browser.
+    """
+
+    def __init__(self, id, future, progress):
+        self.id = id
+        self.future = future
+        self.progress = progress
+        self.finished_at = None
+        self.sent = 0
+
+    def done(self):
+        """ Returns True if the job has finished. """
+        return self.future.done()
+
+    def cancel(self):
+        """ Cancel the job. A running function call is cancelled the next time it
+        reports progress.
+        """
+        self.progress.cancel()
+        self.future.cancel()
+
+    def result(self):
+        """ Return the result of the finished job. Raises the exception of the
+        function call if it failed and ``JobCancelled`` if it was cancelled.
+        """
+        try:
+            return self.future.result(timeout=0)
+        except CancelledError:
+            raise JobCancelled()
+
+
+def _accepts_progress(f):
+    try:
+        parameters = inspect.signature(f).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.name == "_progress" or p.kind == inspect.Parameter.VAR_KEYWORD
+        for p in parameters
+    )
+
+
+def streamed(f):
+    """ Wrap the generator function `f`, so that its yielded values are published as
+    partial results to the ``_progress`` handle of the job and the last value is
+    returned. A value returned by the generator takes precedence over the last
+    yielded value.
+
+    Parameters
+    ----------
+    f: callable
+        The generator function.
+
+    Returns
+    -------
+    callable
+        The wrapped function, which accepts a ``_progress`` keyword argument.
+    """
+    accepts_progress = _accepts_progress(f)
+
+    @wraps(f)
+    def wrapper(*args, _progress=None, **kwargs):
+        if accepts_progress:
+            kwargs["_progress"] = _progress
+        generator = f(*args, **kwargs)
+        result = None
+        try:
+            while True:
+                try:
+                    result = next(generator)
+                except StopIteration as stop:
+                    return stop.value if stop.value is not None else result
+                if _progress is not None:
+                    _progress.publish(result)
+        finally:
+            generator.close()
+
+    signature = inspect.signature(f)
+    if not accepts_progress:
+        progress = inspect.Parameter("_progress", inspect.Parameter.KEYWORD_ONLY)
+        parameters = list(signature.parameters.values())
+        position = len(parameters)
+        if parameters and parameters[-1].kind == inspect.Parameter.VAR_KEYWORD:
+            position -= 1
+        parameters.insert(position, progress)
+        signature = signature.replace(parameters=parameters)
+    # the signature is copied to the outer wrappers, so that the job manager passes
+    # the progress handle
+    wrapper.__signature__ = signature
+    return wrapper
+
+
+class JobManager(object):
+    """ Runs callback functions in a local thread pool and keeps track of the jobs.
+
+    Parameters
+    ----------
+    max_workers: int, optional
+        Maximum number of concurrently running jobs. Default: 4.
+    ttl: float, optional
+        Number of seconds a finished job is kept if its result is never fetched.
+        Default: 600.
+    """
+
+    def __init__(self, max_workers=4, ttl=600.0):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.jobs = {}
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """ The thread pool, which is (re-)created lazily in each process. """
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="dasher-job"
+            )
+            self._pid = os.getpid()
+            self.jobs = {}
+        return self._executor
+
+    def submit(self, f, args):
+        """ Submit a call of `f` with the positional arguments `args`.
+
+        If `f` accepts a ``_progress`` keyword argument, it receives the ``Progress``
+        handle of the job.
+
+        Parameters
+        ----------
+        f: callable
+            The callback function.
+        args: tuple
+            Positional arguments of the call.
+
+        Returns
+        -------
+        Job
+            The submitted job.
+        """
+        progress = Progress()
+        kwargs = {"_progress": progress} if _accepts_progress(f) else {}
+        with self._lock:
+            self._expire()
+            future = self.executor.submit(f, *args, **kwargs)
+            job = Job(f"{os.getpid()}-{uuid.uuid4().hex}", future, progress)
+            future.add_done_callback(lambda _: setattr(job, "finished_at", time.time()))
+            self.jobs[job.id] = job
+        return job
+
+    def _expire(self):
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.finished_at is not None and job.finished_at + self.ttl < now
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        """ Return the job with id `job_id` or ``None`` if it is unknown. """
+        return self.jobs.get(job_id)
+
+    def explain_unknown(self, job_id):
+        """ Return the reason why the job with id `job_id` is unknown.
+
+        Parameters
+        ----------
+        job_id: str
+            Id of the unknown job.
+
+        Returns
+        -------
+        str
+            Message, which is shown instead of the result of the job.
+        """
+        pid = str(job_id).split("-", 1)[0]
+        if pid != str(os.getpid()):
+            return (
+                "The job was started by another server process. Background callbacks "
+                "require the app to be served by a single process."
+            )
+        return "The job has expired. Change a widget to run it again."
+
+    def cancel(self, job_id):
+        """ Cancel and discard the job with id `job_id`, if it exists. """
+        with self._lock:
+            job = self.jobs.pop(job_id, None)
+        if job is not None:
+            job.cancel()
+
+    def discard(self, job_id):
+        """ Discard the job with id `job_id` after its result has been fetched. """
+        with self._lock:
+            self.jobs.pop(job_id, None)
@@ -1,7 +1,14 @@
+import threading
+from collections import OrderedDict
+
 import dash_bootstrap_components as dbc
+import dash_core_components as dcc
 import dash_html_components as html
+from dash.dependencies import ALL
+from dash.dependencies import MATCH
 from dash.dependencies import Input
 from dash.dependencies import Output
+from dash.dependencies import State
 
 from dasher.base import BaseLayout
 
@@ -28,11 +35,25 @@ class BootstrapLayout(BaseLayout):
     widget_cols: int, optional
         Group the interactive components into ``widget_cols`` number of columns.
         Default: 2.
+    max_cached_cards: int, optional
+        Maximum number of rendered tab cards kept in memory. Cards are rendered when
+        their tab is first shown and the least recently shown cards are discarded.
+        Unlimited if ``None``. Default: 64.
+    clientside_tabs: bool, optional
+        If true, tabs are switched in the browser. The card of a tab is loaded from
+        the server when the tab is opened for the first time and stays mounted, but
+        hidden, while other tabs are shown. Switching back to an opened tab neither
+        requests the server nor executes its callback again, and the widgets keep
+        their values. Default: False.
 
     Attributes
     ----------
     widget_cols: int
         Group the interactive components into ``widget_cols`` number of columns.
+    max_cached_cards: int or None
+        Maximum number of rendered tab cards kept in memory.
+    clientside_tabs: bool
+        If true, tabs are switched in the browser.
     include_stylesheets: bool
         If true, includes the standard bootstrap theme as external stylesheets.
     external_stylesheets: list of str, optional
@@ -58,6 +79,8 @@ class BootstrapLayout(BaseLayout):
     tabs_id = "dasher-tabs"
     tabs_content_id = "dasher-tabs-content"
     tab_base = "dasher-tab"
+    tab_pane_type = "dasher-tab-pane"
+    tab_request_type = "dasher-tab-request"
     widgets_base = "dasher-widgets"
 
     def __init__(
@@ -67,12 +90,18 @@ class BootstrapLayout(BaseLayout):
         credits=True,
         include_stylesheets=True,
         widget_cols=2,
+        max_cached_cards=64,
+        clientside_tabs=False,
     ):
         super().__init__(title, widget_spec, credits)
 
         if widget_cols < 1:
             raise ValueError("widget_cols must be >= 1")
         self.widget_cols = widget_cols
+        if max_cached_cards is not None and max_cached_cards < 1:
+            raise ValueError("max_cached_cards must be >= 1")
+        self.max_cached_cards = max_cached_cards
+        self.clientside_tabs = clientside_tabs
         if include_stylesheets:
             self.external_stylesheets = [dbc.themes.BOOTSTRAP]
         self.navbar, self.body = self.render_base_layout()
@@ -80,6 +109,9 @@ class BootstrapLayout(BaseLayout):
         self.tabs = None
         self.tabs_content = None
         self.callbacks = {}
+        self._card_kw = {}
+        self._cards = OrderedDict()
+        self._cards_lock = threading.Lock()
 
     def render_base_layout(self):
         """ Create base layout with navigation bar and body container. """
@@ -105,18 +137,18 @@ class BootstrapLayout(BaseLayout):
         return navbar, body
 
     @staticmethod
-    def _chunks(l, n):
-        """ Yield successive n-sized chunks from l.
+    def _chunks(items, n):
+        """ Yield successive n-sized chunks from items.
 
         Parameters
         ----------
-        l: iterable
+        items: iterable
             Iterable to slice into chunks.
         n: int
             Maximum size of each chunk.
         """
-        for i in range(0, len(l), n):
-            yield l[i : i + n]
+        for i in range(0, len(items), n):
+            yield items[i : i + n]
 
     def render_card(self, callback, **kwargs):
         """ Renders a card with the interactive components and the output container.
@@ -138,6 +170,11 @@ class BootstrapLayout(BaseLayout):
 
         cols = [dbc.Col(w.layout) for w in callback.widgets]
         rows = [dbc.Row(row) for row in self._chunks(cols, widget_cols)]
+        if callback.submit == "submit":
+            button = dbc.Button(
+                "Apply", id=f"{self.submit_base}-{callback.id}", color="primary"
+            )
+            rows.append(dbc.Row(dbc.Col(button)))
         widgets_form = dbc.Form(rows, id=f"{self.widgets_base}-{callback.id}")
 
         output = dbc.Container(
@@ -146,11 +183,57 @@ class BootstrapLayout(BaseLayout):
 
         card_header = dbc.CardHeader(callback.name)
         card_body = dbc.CardBody([widgets_form, output])
+        if callback.background is not None:
+            card_body.children.extend(self.render_background_components(callback))
+        if callback.preview is not None:
+            card_body.children.extend(self.render_preview_components(callback))
         if callback.description is not None:
             card_title = html.H4(callback.description, className="card-title")
             card_body.children.insert(0, card_title)
         return dbc.Card([card_header, card_body])
 
+    def render_job_status(self, job):
+        """ Renders a progress bar while a background job is running or an alert if
+        it failed.
+
+        Parameters
+        ----------
+        job: dasher.jobs.Job
+            The background job.
+
+        Returns
+        -------
+        list of dash.development.base_component.Component
+            Content of the output container.
+        """
+        if job.done():
+            return [dbc.Alert(str(job.future.exception()), color="danger")]
+        fraction = job.progress.fraction
+        progress = dbc.Progress(
+            value=100 if fraction is None else 100 * fraction,
+            striped=True,
+            animated=True,
+        )
+        if job.progress.message is None:
+            return [progress]
+        return [progress, html.Small(job.progress.message, className="text-muted")]
+
+    def render_unknown_job(self, message):
+        """ Renders an alert if the job of a background callback is unknown to the
+        process handling the poll.
+
+        Parameters
+        ----------
+        message: str
+            The reason why the job is unknown.
+
+        Returns
+        -------
+        list of dash.development.base_component.Component
+            Content of the output container.
+        """
+        return [dbc.Alert(message, color="warning")]
+
     def add_callback(self, callback, app, **kwargs):
         """ Add callback to the layout.
 
@@ -174,19 +257,162 @@ class BootstrapLayout(BaseLayout):
             )
             self.tabs_content = html.Div(id=self.tabs_content_id)
             self.body.children.extend((self.tabs, self.tabs_content))
-            app.callback(
-                Output(self.tabs_content.id, "children"),
-                [Input(self.tabs.id, "active_tab")],
-            )(self.render_callback)
+            if self.clientside_tabs:
+                self.register_clientside_tabs(app)
+            else:
+                app.callback(
+                    Output(self.tabs_content.id, "children"),
+                    [Input(self.tabs.id, "active_tab")],
+                )(self.render_callback)
         elif len(self.callbacks) == 1:
             del self.tabs.style["display"]
 
         self.tabs.children.append(tab)
+        if self.clientside_tabs:
+            self.tabs_content.children = self.tabs_content.children or []
+            self.tabs_content.children.append(self.render_tab_pane(callback))
 
-        content = self.render_card(callback, **kwargs)
-
+        # the card is rendered by get_card when the tab is shown for the first time
         self.callbacks[callback.id] = callback
-        callback.layout = content
+        self._card_kw[callback.id] = kwargs
+        callback._layout = self
+
+    def get_card(self, id):
+        """ Return the card of a callback, rendering it if it is not cached.
+        The least recently used cards are discarded if more than `max_cached_cards`
+        are cached, including the cached components of their widgets.
+
+        Parameters
+        ----------
+        id: str
+            ID of the callback.
+
+        Returns
+        -------
+        dash.development.base_component.Component
+            Card of the callback.
+        """
+        with self._cards_lock:
+            card = self._cards.get(id)
+            if card is not None:
+                self._cards.move_to_end(id)
+                return card
+
+        callback = self.callbacks[id]
+        card = self.render_card(callback, **self._card_kw[id])
+
+        with self._cards_lock:
+            card = self._cards.setdefault(id, card)
+            self._cards.move_to_end(id)
+            while (
+                self.max_cached_cards is not None
+                and len(self._cards) > self.max_cached_cards
+            ):
+                evicted, _ = self._cards.popitem(last=False)
+                for widget in self.callbacks[evicted].widgets:
+                    widget.invalidate()
+        return card
+
+    def retained(self, callback_id):
+        """ Return the cached card of a callback, if any.
+
+        Parameters
+        ----------
+        callback_id: str
+            Id of the callback.
+
+        Returns
+        -------
+        list
+            Retained objects.
+        """
+        with self._cards_lock:
+            card = self._cards.get(callback_id)
+        return [card] if card is not None else []
+
+    def export_requests(self):
+        """ Return the requests of the callbacks rendering the tabs, which are
+        evaluated by the static export of the app.
+
+        Returns
+        -------
+        list of tuple
+            Tuples ``(callback_output, output, inputs)`` for each tab.
+        """
+        requests = []
+        for id in self.callbacks:
+            if self.clientside_tabs:
+                pane = {"type": self.tab_pane_type, "index": id}
+                request = {"type": self.tab_request_type, "index": id}
+                callback_output = Output(
+                    {"type": self.tab_pane_type, "index": MATCH}, "children"
+                )
+                output = Output(pane, "children")
+                inputs = [(Input(request, "data"), id)]
+            else:
+                callback_output = output = Output(self.tabs_content_id, "children")
+                inputs = [(Input(self.tabs_id, "active_tab"), id)]
+            requests.append((callback_output, output, inputs))
+        return requests
+
+    def render_tab_pane(self, callback):
+        """ Renders the initially empty and hidden pane of a tab, which is used if
+        `clientside_tabs` is true.
+
+        Parameters
+        ----------
+        callback: dasher.base.Callback
+            The callback to render the pane for.
+
+        Returns
+        -------
+        dash_html_components.Div
+            Pane and the store requesting its card from the server.
+        """
+        request = dcc.Store(id={"type": self.tab_request_type, "index": callback.id})
+        pane = html.Div(
+            id={"type": self.tab_pane_type, "index": callback.id},
+            style={"display": "none"},
+        )
+        return html.Div([request, pane])
+
+    def register_clientside_tabs(self, app):
+        """ Register the callbacks switching the tabs in the browser, which are used
+        if `clientside_tabs` is true.
+
+        A clientside callback shows the pane of the active tab and hides the others.
+        If the pane of the active tab is still empty, it writes the id of the tab to
+        the request store of the pane, which loads the card from the server.
+
+        Parameters
+        ----------
+        app: dash.Dash
+            The dash app.
+        """
+        pane = {"type": self.tab_pane_type, "index": ALL}
+        request = {"type": self.tab_request_type, "index": ALL}
+        app.clientside_callback(
+            """
+            function(active, ids, children) {
+                var no_update = window.dash_clientside.no_update;
+                var styles = ids.map(function(id) {
+                    return id.index === active ? {} : {display: "none"};
+                });
+                var requests = ids.map(function(id, i) {
+                    return id.index === active && !children[i] ? active : no_update;
+                });
+                return [styles, requests];
+            }
+            """,
+            [Output(pane, "style"), Output(request, "data")],
+            [Input(self.tabs.id, "active_tab")],
+            [State(pane, "id"), State(pane, "children")],
+        )
+        app.callback(
+            Output({"type": self.tab_pane_type, "index": MATCH}, "children"),
+            [Input({"type": self.tab_request_type, "index": MATCH}, "data")],
+            prevent_initial_call=True,
+        )(self.render_callback)
 
     def render_callback(self, id):
         """ Callback method to switch between tabs.
@@ -201,4 +427,4 @@ class BootstrapLayout(BaseLayout):
         dash.development.base_component.Component
             Layout of the callback.
         """
-        return self.callbacks[id].layout
+        return self.get_card(id)
@@ -22,33 +22,84 @@ interactive widgets:
   Any dash component will be used as-is. This allows full customization of a
   widget if desired. The widgets ``value`` will be used as argument to
   the callback function.
+* ``numpy.ndarray``, ``pandas.Series`` and ``pandas.Index`` (if installed):
+  Numeric arrays generate a range slider, datetime arrays a date range picker and
+  all other arrays a dropdown menu of their unique values or categories. The
+  callback function receives ``[min, max]`` of a range slider and the tuple
+  ``(start_date, end_date)`` of a date range picker. Missing values are ignored.
+  ``numpy`` and ``pandas`` are not imported by this module: an array can only be
+  passed if its package has been imported already.
 
 """
 
+import json
+import sys
 from abc import ABC
+from bisect import bisect_left
 from collections import OrderedDict
 from collections.abc import Iterable
 from collections.abc import Mapping
+from decimal import Decimal
 from numbers import Integral
 from numbers import Real
 
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
+from dash.dependencies import Input
+from dash.dependencies import Output
+from dash.dependencies import State
 from dash.development.base_component import Component
 
 from dasher.base import BaseWidget
 from dasher.base import CustomWidget
 from dasher.base import WidgetPassthroughMixin
+from dasher.base import cached_property
 
 from .min_max_value import get_min_max_value
 
 
+def slider_marks(minimum, maximum, step, max_ticks):
+    """ Generate the marks of a slider.
+    The cost only depends on `max_ticks`, not on the number of steps of the slider.
+
+    Integer sliders get ticks on multiples of `step`, all other sliders get evenly
+    spaced ticks on the steps of the slider plus a tick at `maximum`.
+
+    Parameters
+    ----------
+    minimum: int or float
+        Minimum of the slider.
+    maximum: int or float
+        Maximum of the slider.
+    step: int or float
+        Step of the slider. Must be > 0.
+    max_ticks: int
+        Maximum number of ticks (not counting the tick at `maximum` of float
+        sliders).
+
+    Returns
+    -------
+    dict
+        Marks of the slider.
+    """
+    if all(isinstance(i, Integral) for i in (minimum, maximum, step)):
+        max_mark_step = (maximum - minimum) // max_ticks
+        tick_step = step * max(1, -(-max_mark_step // step))
+        return {i: str(i) for i in range(minimum, maximum + 1, tick_step)}
+
+    n_steps = int((maximum - minimum) / step)
+    stride = max(1, n_steps // max_ticks)
+    ticks = [minimum + step * i for i in range(0, n_steps, stride)] + [maximum]
+    return {int(i) if i % 1 == 0 else i: "{:.3g}".format(i) for i in ticks}
+
+
 class BootstrapWidget(BaseWidget, ABC):
     """ Abstract base class for Bootstrap widgets.
-    Implements the default layout property, which is used by most the widgets.
+    Implements the default layout property, which is used by most the widgets. The
+    `component` and `layout` of the widgets are built once and cached.
     """
 
-    @property
+    @cached_property
     def layout(self):
         return dbc.FormGroup(
             [dbc.Label(self.label, html_for=self.name), self.component]
@@ -80,11 +131,14 @@ class BoolWidget(BootstrapWidget):
     def __init__(self, name, x, label=None, dependency="checked"):
         super().__init__(name, x, label, dependency)
 
-    @property
+    def domain(self):
+        return [False, True]
+
+    @cached_property
     def component(self):
         return dbc.Checkbox(id=self.name, checked=False, className="form-check-input")
 
-    @property
+    @cached_property
     def layout(self):
         return dbc.FormGroup(
             [
@@ -96,32 +150,165 @@ class BoolWidget(BootstrapWidget):
 
 
 class StringWidget(BootstrapWidget):
-    """ Input field component used for for strings. """
+    """ Input field component used for for strings. If `debounce` is true, the value
+    is only updated when the user presses enter or the field loses focus.
+    """
 
-    @property
+    @cached_property
     def component(self):
-        return dbc.Input(id=self.name, type="text", value=self.x)
+        return dbc.Input(
+            id=self.name, type="text", value=self.x, debounce=self.debounce
+        )
 
 
 class IterableWidget(BootstrapWidget):
-    """ Dropdown component used for iterables and mappings. """
+    """ Dropdown component used for iterables and mappings.
 
-    @property
-    def component(self):
-        if isinstance(self.x, Mapping):
-            options = [{"label": k, "value": v} for k, v in self.x.items()]
+    The iterable is consumed once, when the widget is created, into lists of the
+    labels and values. If it contains more than `max_options` entries, only the first
+    `page_size` options are part of the layout. Further options are loaded from the
+    server as the user types, using a sorted index of the labels to find the options
+    starting with the search value. Values need not be hashable, e.g. lists.
+
+    Parameters
+    ----------
+    name: str
+        Name of the widget.
+    x: iterable or mapping
+        Options of the dropdown. A mapping uses its keys as labels and its values as
+        values.
+    label: str, optional
+        The label for the component.
+    dependency: str, optional
+        The attribute used for the ``dash.dependencies.Input`` dependency.
+        Default: "value".
+    max_options: int, default 1000
+        Maximum number of options, which are part of the layout. Larger iterables are
+        searched on the server.
+    page_size: int, default 100
+        Number of options shown at once for large iterables.
+
+    Attributes
+    ----------
+    labels: list
+        Labels of the options.
+    values: list
+        Values of the options.
+    """
+
+    def __init__(
+        self, name, x, label=None, dependency="value", max_options=1000, page_size=100
+    ):
+        super().__init__(name, x, label, dependency)
+        if isinstance(x, Mapping):
+            self.labels = list(x.keys())
+            self.values = list(x.values())
         else:
-            options = [{"label": x, "value": x} for x in self.x]
-
-        if len(options) > 0:
-            return dcc.Dropdown(
-                id=self.name,
-                options=options,
-                clearable=False,
-                value=options[0]["value"],
-            )
+            # labels and values are the same objects
+            self.labels = self.values = list(x)
+        self.max_options = max_options
+        self.page_size = page_size
+
+    @property
+    def options(self):
+        """ List of all options of the dropdown, which is built on access. """
+        return [self.option(i) for i in range(len(self.values))]
+
+    def option(self, i):
+        """ Return the option at position `i`. """
+        return {"label": self.labels[i], "value": self.values[i]}
+
+    @property
+    def large(self):
+        """ True if the options are searched on the server. """
+        return len(self.values) > self.max_options
+
+    @cached_property
+    def index(self):
+        """ Sorted list of the lowercase labels and the positions of the options. """
+        return sorted((str(label).lower(), i) for i, label in enumerate(self.labels))
+
+    @staticmethod
+    def value_key(value):
+        """ Return the key of `value` in ``value_positions``: its JSON encoding, which
+        is hashable and identical for the value of an option and the value delivered
+        by dash, e.g. a tuple and a list.
+        """
+        return json.dumps(_json_number(value), sort_keys=True, default=repr)
+
+    @cached_property
+    def value_positions(self):
+        """ Dictionary mapping the ``value_key`` of the values to the positions of the
+        options.
+        """
+        positions = {}
+        for i, value in enumerate(self.values):
+            positions.setdefault(self.value_key(value), i)
+        return positions
+
+    def search(self, search_value, value=None):
+        """ Return up to `page_size` options, whose labels start with `search_value`
+        (case-insensitive). The option of the selected `value` is always included, so
+        that the dropdown can display its label.
+
+        Parameters
+        ----------
+        search_value: str or None
+            The text entered by the user.
+        value: object, optional
+            The selected value.
+
+        Returns
+        -------
+        list of dict
+            Matching options.
+        """
+        if not search_value:
+            positions = list(range(min(self.page_size, len(self.values))))
         else:
+            prefix = search_value.lower()
+            start = bisect_left(self.index, (prefix,))
+            positions = []
+            for label, i in self.index[start : start + self.page_size]:
+                if not label.startswith(prefix):
+                    break
+                positions.append(i)
+        if value is not None:
+            selected = self.value_positions.get(self.value_key(value))
+            if selected is not None and selected not in positions:
+                positions.append(selected)
+        return [self.option(i) for i in positions]
+
+    def domain(self):
+        return list(self.values)
+
+    @cached_property
+    def component(self):
+        if len(self.values) == 0:
             return None
+        value = self.values[0]
+        options = self.search(None) if self.large else self.options
+        return dcc.Dropdown(id=self.name, options=options, clearable=False, value=value)
+
+    def register_callbacks(self, app):
+        """ Register the callback searching the options of large iterables. """
+        if self.large:
+            app.callback(
+                Output(self.name, "options"),
+                [Input(self.name, "search_value")],
+                [State(self.name, "value")],
+            )(self.search)
+
+
+def _decimals(x):
+    return max(0, -Decimal(repr(x)).as_tuple().exponent)
+
+
+def _json_number(x):
+    # JSON does not distinguish 1.0 from 1, which dash delivers as int
+    if isinstance(x, float) and x.is_integer():
+        return int(x)
+    return x
 
 
 class TupleWidget(BootstrapWidget):
@@ -156,9 +343,17 @@ class TupleWidget(BootstrapWidget):
         super().__init__(name, x, label, dependency)
         self.slider_max_marks = slider_max_ticks
         self.slider_float_steps = slider_float_steps
+        if dependency == "value":
+            self.drag_dependency = "drag_value"
 
-    @property
-    def component(self):
+    def slider_range(self):
+        """ Return the range of the slider.
+
+        Returns
+        -------
+        tuple
+            Minimum, maximum, step and initial value of the slider.
+        """
         step = None
 
         if len(self.x) == 1:
@@ -167,27 +362,41 @@ class TupleWidget(BootstrapWidget):
             minimum, maximum, value = get_min_max_value(self.x[0], self.x[1])
         elif len(self.x) == 3:
             step = self.x[2]
-            if step < 0:
-                raise ValueError("step must be >= 0")
+            if step <= 0:
+                raise ValueError("step must be > 0")
             minimum, maximum, value = get_min_max_value(self.x[0], self.x[1], step=step)
         else:
             raise ValueError("tuple must be (value, ), (min, max) or (min, max, step)")
 
-        if all(isinstance(i, Integral) for i in self.x):
-            if step is None:
+        if step is None:
+            if all(isinstance(i, Integral) for i in self.x):
                 step = 1
-            max_mark_step = (maximum - minimum) // self.slider_max_marks
-            ticks = list(range(minimum, maximum + 1, max(step, max_mark_step)))
-            marks = {i: str(i) for i in ticks}
+            else:
+                step = (maximum - minimum) / (self.slider_float_steps - 1) or 1.0
+        return minimum, maximum, step, value
+
+    def domain(self):
+        """ Return the values on the steps of the slider and its initial value.
+        Values are rounded to the precision of the step like the slider in the
+        browser does, and integral floats are converted to ``int``, as dash delivers
+        them.
+        """
+        minimum, maximum, step, value = self.slider_range()
+        if isinstance(step, Integral) and isinstance(minimum, Integral):
+            values = list(range(minimum, maximum + 1, step))
         else:
-            if step is None:
-                step = (maximum - minimum) / (self.slider_float_steps - 1)
-
-            ticks = list(
-                minimum + step * i for i in range(0, int((maximum - minimum) / step))
-            )
-            ticks = ticks[:: max(1, len(ticks) // self.slider_max_marks)] + [maximum]
-            marks = {int(i) if i % 1 == 0 else i: "{:.3g}".format(i) for i in ticks}
+            digits = max(_decimals(step), _decimals(minimum))
+            n = int((maximum - minimum) / step + 1e-9) + 1
+            values = [_json_number(round(minimum + i * step, digits)) for i in range(n)]
+        value = _json_number(value)
+        if value not in values:
+            values.append(value)
+        return values
+
+    @cached_property
+    def component(self):
+        minimum, maximum, step, value = self.slider_range()
+        marks = slider_marks(minimum, maximum, step, self.slider_max_marks)
 
         return dcc.Slider(
             id=self.name, min=minimum, max=maximum, step=step, value=value, marks=marks
@@ -201,6 +410,236 @@ class NumberWidget(TupleWidget):
         super().__init__(name, (x,), label, dependency)
 
 
+def _array_types():
+    # arrays can only exist if their package has been imported
+    types = ()
+    np = sys.modules.get("numpy")
+    if np is not None:
+        types += (np.ndarray,)
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        types += (pd.Series, pd.Index)
+    return types
+
+
+class ArrayLike(ABC):
+    """ Virtual base class of ``numpy.ndarray``, ``pandas.Series`` and
+    ``pandas.Index``, which does not import ``numpy`` or ``pandas``.
+    """
+
+    @classmethod
+    def __subclasshook__(cls, C):
+        if cls is ArrayLike and issubclass(C, _array_types()):
+            return True
+        return NotImplemented
+
+
+def _is_pandas(x):
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(x, (pd.Series, pd.Index))
+
+
+def _scalar(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def _array_kind(x):
+    """ Classify an array as "numeric", "datetime" or "categorical". """
+    if _is_pandas(x):
+        import pandas as pd
+
+        if isinstance(x.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(
+            x.dtype
+        ):
+            return "categorical"
+        elif pd.api.types.is_numeric_dtype(x.dtype):
+            return "numeric"
+        elif pd.api.types.is_datetime64_any_dtype(x.dtype):
+            return "datetime"
+        return "categorical"
+    kind = x.dtype.kind
+    if kind in "iuf":
+        return "numeric"
+    elif kind == "M":
+        return "datetime"
+    return "categorical"
+
+
+def _array_min_max(x):
+    """ Minimum and maximum of an array, ignoring missing values. """
+    if _is_pandas(x):
+        x = x.dropna()
+    elif x.dtype.kind in "fcmM":
+        import numpy as np
+
+        x = x[~np.isnan(x)]
+    if len(x) == 0:
+        raise ValueError("array must contain at least one value, which is not missing")
+    return x.min(), x.max()
+
+
+class RangeSliderWidget(BootstrapWidget):
+    """ Range slider component used for numeric arrays.
+    The range of the slider is determined by a vectorized reduction of the array.
+
+    Parameters
+    ----------
+    name: str
+        Name of the widget.
+    x: numpy.ndarray or pandas.Series or pandas.Index
+        Numeric array used to configure the range slider.
+    label: str, optional
+        The label for the component.
+    dependency: str, optional
+        The attribute used for the ``dash.dependencies.Input`` dependency.
+        Default: "value".
+    slider_max_ticks: int, default 8
+        Maximum number of ticks to draw for the slider.
+    slider_float_steps: int, default 60
+        Number of steps of float sliders.
+    """
+
+    def __init__(
+        self,
+        name,
+        x,
+        label=None,
+        dependency="value",
+        slider_max_ticks=8,
+        slider_float_steps=60,
+    ):
+        super().__init__(name, x, label, dependency)
+        minimum, maximum = _array_min_max(x)
+        self.minimum, self.maximum = _scalar(minimum), _scalar(maximum)
+        if isinstance(self.minimum, Integral) and isinstance(self.maximum, Integral):
+            self.step = 1
+        else:
+            diff = self.maximum - self.minimum
+            self.step = diff / (slider_float_steps - 1) or 1.0
+        self.slider_max_marks = slider_max_ticks
+        if dependency == "value":
+            self.drag_dependency = "drag_value"
+
+    @cached_property
+    def component(self):
+        return dcc.RangeSlider(
+            id=self.name,
+            min=self.minimum,
+            max=self.maximum,
+            step=self.step,
+            value=[self.minimum, self.maximum],
+            marks=slider_marks(
+                self.minimum, self.maximum, self.step, self.slider_max_marks
+            ),
+        )
+
+
+def _date_string(value):
+    if hasattr(value, "date"):
+        return value.date().isoformat()
+    import numpy as np
+
+    return str(np.datetime64(value, "D"))
+
+
+class DateRangeWidget(BootstrapWidget):
+    """ Date range picker component used for datetime arrays.
+    The callback function receives the tuple ``(start_date, end_date)`` of ISO
+    formatted dates.
+
+    Parameters
+    ----------
+    name: str
+        Name of the widget.
+    x: numpy.ndarray or pandas.Series or pandas.Index
+        Datetime array used to configure the date range picker.
+    label: str, optional
+        The label for the component.
+    dependency: tuple of str, optional
+        The attributes used for the ``dash.dependencies.Input`` dependencies.
+        Default: ("start_date", "end_date").
+    """
+
+    def __init__(self, name, x, label=None, dependency=("start_date", "end_date")):
+        super().__init__(name, x, label, dependency)
+        minimum, maximum = _array_min_max(x)
+        self.start_date, self.end_date = _date_string(minimum), _date_string(maximum)
+
+    @cached_property
+    def component(self):
+        return dcc.DatePickerRange(
+            id=self.name,
+            min_date_allowed=self.start_date,
+            max_date_allowed=self.end_date,
+            start_date=self.start_date,
+            end_date=self.end_date,
+        )
+
+
+def _unique_values(x):
+    """ Sorted unique values or categories of an array as a list of python objects,
+    ignoring missing values.
+    """
+    if _is_pandas(x):
+        import pandas as pd
+
+        if isinstance(x.dtype, pd.CategoricalDtype):
+            return x.dtype.categories.tolist()
+        return x.dropna().unique().tolist()
+    if x.dtype.kind != "O":
+        import numpy as np
+
+        values = np.unique(x)
+        if values.dtype.kind in "fcmM":
+            values = values[~np.isnan(values)]
+        return values.tolist()
+    # hashing is linear, unlike sorting an object array, only the unique values
+    # are sorted
+    values = [v for v in dict.fromkeys(x.ravel().tolist()) if v is not None and v == v]
+    try:
+        values.sort()
+    except TypeError:
+        # unorderable objects
+        pass
+    return values
+
+
+class CategoricalWidget(IterableWidget):
+    """ Dropdown component used for categorical arrays. The options are the categories
+    of a categorical ``pandas`` array or the unique values of any other array.
+    """
+
+    def __init__(self, name, x, label=None, dependency="value", **kwargs):
+        super().__init__(name, _unique_values(x), label, dependency, **kwargs)
+
+
+def ArrayWidget(name, x, label=None):
+    """ Create the widget for an array depending on its dtype: a ``RangeSliderWidget``
+    for numeric arrays, a ``DateRangeWidget`` for datetime arrays and a
+    ``CategoricalWidget`` for all other arrays.
+
+    Parameters
+    ----------
+    name: str
+        Name of the widget.
+    x: numpy.ndarray or pandas.Series or pandas.Index
+        The array.
+    label: str, optional
+        The label for the component.
+
+    Returns
+    -------
+    BootstrapWidget
+        The widget.
+    """
+    kind = _array_kind(x)
+    if kind == "numeric":
+        return RangeSliderWidget(name, x, label)
+    elif kind == "datetime":
+        return DateRangeWidget(name, x, label)
+    return CategoricalWidget(name, x, label)
+
+
 WIDGET_SPEC = OrderedDict(
     [
         ((Component, CustomWidget), PassthroughWidget),
@@ -208,6 +647,7 @@ WIDGET_SPEC = OrderedDict(
         (str, StringWidget),
         ((Real, Integral), NumberWidget),
         (tuple, TupleWidget),
+        (ArrayLike, ArrayWidget),
         (Iterable, IterableWidget),
     ]
 )
@@ -0,0 +1,215 @@
+""" Memory accounting of dasher callbacks.
+
+``memory_report`` estimates the memory retained by each tab of an app: the components
+of its widgets and its rendered card held by the layout, the keyword arguments passed
+to the ``callback`` decorator and the entries of its result cache.
+
+If the app is created with ``memory_kw``, a ``MemoryTracker`` additionally measures the
+peak allocation of a fraction of the callback calls using ``tracemalloc`` and the
+report is exposed as JSON at a route of the flask server.
+
+The retained sizes are estimates: they are computed by following the references of
+the objects and summing ``sys.getsizeof`` of every object reached once, excluding
+modules, classes and functions, which are shared.
+"""
+
+import gc
+import sys
+import threading
+import tracemalloc
+from collections import namedtuple
+from functools import wraps
+from random import random
+from types import BuiltinFunctionType
+from types import FunctionType
+from types import ModuleType
+
+import flask
+
+TabMemory = namedtuple(
+    "TabMemory", ["callback", "layout", "kw", "cache", "samples", "peak", "max_peak"]
+)
+""" Memory report of a tab, as returned by ``memory_report``. Sizes are in bytes. """
+
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+
+def retained_size(objects, exclude=()):
+    """ Estimate the memory retained by `objects`.
+
+    Parameters
+    ----------
+    objects: iterable
+        The objects.
+    exclude: iterable, optional
+        Objects, which are not counted, e.g. because they are accounted for
+        elsewhere. Objects only reachable through them are not counted either.
+
+    Returns
+    -------
+    int
+        Total size in bytes of the objects and all objects reachable from them.
+    """
+    seen = {id(obj) for obj in exclude}
+    pending = list(objects)
+    size = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return size
+
+
+class MemoryTracker(object):
+    """ Measures the peak allocation of a fraction of the callback calls using
+    ``tracemalloc``.
+
+    Tracing slows down all allocations of the process, so that it is enabled for the
+    sampled calls only, one at a time. Allocations of other threads during a sampled
+    call are included in its peak. Calls of callbacks executed in a worker process
+    are measured in the app process, i.e. the peak covers receiving their result.
+
+    Parameters
+    ----------
+    sample_rate: float, optional
+        Fraction of the calls, which are measured. Default: 0.01.
+    route: str, optional
+        Route of the memory report endpoint. Default: "/_dasher/memory".
+
+    Attributes
+    ----------
+    peaks: dict
+        Number of samples, sum of the peaks and maximum peak in bytes by callback id.
+    """
+
+    def __init__(self, sample_rate=0.01, route="/_dasher/memory"):
+        self.sample_rate = sample_rate
+        self.route = route
+        self.peaks = {}
+        self._tracing = threading.Lock()
+        self._lock = threading.Lock()
+
+    def call(self, callback_id, f, args, kwargs):
+        """ Call `f` and measure its peak allocation if the call is sampled.
+
+        Parameters
+        ----------
+        callback_id: str
+            Id of the callback.
+        f: callable
+            The callback function.
+        args: tuple
+            Positional arguments.
+        kwargs: dict
+            Keyword arguments.
+
+        Returns
+        -------
+        object
+            The result of the call.
+        """
+        if (
+            random() >= self.sample_rate
+            or tracemalloc.is_tracing()
+            or not self._tracing.acquire(blocking=False)
+        ):
+            return f(*args, **kwargs)
+        try:
+            tracemalloc.start()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.record(callback_id, peak)
+        finally:
+            self._tracing.release()
+
+    def record(self, callback_id, peak):
+        """ Record the peak allocation `peak` of a call of a callback. """
+        with self._lock:
+            samples, total, max_peak = self.peaks.get(callback_id, (0, 0, 0))
+            self.peaks[callback_id] = (samples + 1, total + peak, max(max_peak, peak))
+
+    def register_route(self, server, app):
+        """ Expose the memory report of `app` as JSON at `route` of the flask server.
+
+        Parameters
+        ----------
+        server: flask.Flask
+            The flask server of the app.
+        app: dasher.Dasher
+            The dasher app.
+        """
+
+        def serve():
+            return flask.jsonify([row._asdict() for row in memory_report(app)])
+
+        server.add_url_rule(self.route, "dasher_memory", serve)
+
+
+def tracked(f, tracker, callback_id):
+    """ Wrap `f`, so that the peak allocation of its calls is sampled by `tracker`.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function.
+    tracker: MemoryTracker
+        The memory tracker.
+    callback_id: str
+        Id of the callback.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return tracker.call(callback_id, f, args, kwargs)
+
+    return wrapper
+
+
+def memory_report(app):
+    """ Report the memory retained by each tab of `app`, sorted by total size.
+
+    Parameters
+    ----------
+    app: dasher.Dasher
+        The dasher app.
+
+    Returns
+    -------
+    list of TabMemory
+        Retained sizes of the layout, the keyword arguments and the cache entries and
+        the sampled peak allocation of the calls (``None`` without samples) of each
+        callback.
+    """
+    layout = app.api.layout
+    peaks = app.memory.peaks if app.memory is not None else {}
+    report = []
+    for callback in app.callbacks.values():
+        kw_values = list(callback.kw.values())
+        layout_size = retained_size(
+            [callback.widgets, layout.retained(callback.id)], exclude=kw_values
+        )
+        cache = callback.cache.nbytes if callback.cache is not None else 0
+        samples, total, max_peak = peaks.get(callback.id, (0, 0, None))
+        report.append(
+            TabMemory(
+                callback=callback.id,
+                layout=layout_size,
+                kw=retained_size(kw_values),
+                cache=cache,
+                samples=samples,
+                peak=total // samples if samples else None,
+                max_peak=max_peak,
+            )
+        )
+    return sorted(report, key=lambda row: row.layout + row.kw + row.cache, reverse=True)
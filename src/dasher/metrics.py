@@ -0,0 +1,180 @@
+""" Prometheus metrics of dasher callbacks.
+
+If the app is created with ``metrics_kw``, the dash callbacks of every dasher callback
+and the tab switching are instrumented with latency histograms, call, error and
+in-flight counts and the size of the responses. The metrics are exposed in the
+Prometheus text format at a route of the flask server (default: ``/metrics``).
+
+If the app is served by multiple worker processes, set the ``PROMETHEUS_MULTIPROC_DIR``
+environment variable to an empty directory shared by the workers before starting the
+server. The metrics of all workers are then aggregated by the multiprocess mode of
+``prometheus_client``.
+
+Requires the ``prometheus_client`` package (``pip install dasher[metrics]``).
+"""
+
+import os
+import time
+from functools import wraps
+
+import flask
+from dash.exceptions import PreventUpdate
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+TABS = "render_callback"
+""" Value of the ``callback`` label of the tab switching callbacks. """
+
+
+def _multiprocess_dir():
+    return os.environ.get(
+        "PROMETHEUS_MULTIPROC_DIR", os.environ.get("prometheus_multiproc_dir")
+    )
+
+
+class Metrics(object):
+    """ Prometheus metrics of the callbacks of a dasher app.
+
+    All metrics carry the labels ``callback``, the id of the dasher callback (or
+    ``"render_callback"`` for the tab switching), and ``output``, the id of the dash
+    callback.
+
+    Parameters
+    ----------
+    route: str, optional
+        Route of the metrics endpoint. Default: "/metrics".
+    namespace: str, optional
+        Prefix of the metric names. Default: "dasher".
+    buckets: tuple of float, optional
+        Buckets of the latency histogram in seconds. Default: buckets of
+        ``prometheus_client``.
+    registry: prometheus_client.CollectorRegistry, optional
+        Registry of the metrics. Default: a new registry.
+
+    Attributes
+    ----------
+    latency: prometheus_client.Histogram
+        Latency of the callbacks in seconds, including the serialization of the
+        response.
+    calls: prometheus_client.Counter
+        Number of calls.
+    errors: prometheus_client.Counter
+        Number of calls raising an exception other than ``PreventUpdate``.
+    in_progress: prometheus_client.Gauge
+        Number of running calls.
+    response_size: prometheus_client.Histogram
+        Size of the serialized responses in bytes.
+    """
+
+    def __init__(
+        self, route="/metrics", namespace="dasher", buckets=None, registry=None
+    ):
+        if prometheus_client is None:
+            raise ImportError("metrics require the prometheus_client package")
+        self.route = route
+        self.registry = (
+            registry if registry is not None else prometheus_client.CollectorRegistry()
+        )
+        labels = ("callback", "output")
+        kw = {"namespace": namespace, "registry": self.registry}
+        latency_kw = dict(kw)
+        if buckets is not None:
+            latency_kw["buckets"] = buckets
+        self.latency = prometheus_client.Histogram(
+            "callback_duration_seconds", "Latency of callbacks.", labels, **latency_kw
+        )
+        self.calls = prometheus_client.Counter(
+            "callback_calls", "Number of callback calls.", labels, **kw
+        )
+        self.errors = prometheus_client.Counter(
+            "callback_errors", "Number of failed callback calls.", labels, **kw
+        )
+        self.in_progress = prometheus_client.Gauge(
+            "callback_in_progress",
+            "Number of running callback calls.",
+            labels,
+            multiprocess_mode="livesum",
+            **kw,
+        )
+        self.response_size = prometheus_client.Histogram(
+            "callback_response_bytes",
+            "Size of callback responses.",
+            labels,
+            buckets=[2 ** i for i in range(8, 28, 2)],
+            **kw,
+        )
+
+    def instrument(self, app, output, callback_id):
+        """ Instrument a registered dash callback.
+
+        Parameters
+        ----------
+        app: dash.Dash
+            The dash app.
+        output: str
+            Id of the dash callback, i.e. its key in ``app.callback_map``.
+        callback_id: str
+            Id of the dasher callback, which is used as ``callback`` label.
+        """
+        f = app.callback_map[output]["callback"]
+        labels = (callback_id, output)
+        latency = self.latency.labels(*labels)
+        calls = self.calls.labels(*labels)
+        errors = self.errors.labels(*labels)
+        in_progress = self.in_progress.labels(*labels)
+        response_size = self.response_size.labels(*labels)
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            calls.inc()
+            start = time.perf_counter()
+            try:
+                with in_progress.track_inprogress():
+                    response = f(*args, **kwargs)
+            except PreventUpdate:
+                raise
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                latency.observe(time.perf_counter() - start)
+            # the JSON responses of dash are ASCII, so characters equal bytes
+            response_size.observe(len(response))
+            return response
+
+        app.callback_map[output]["callback"] = wrapper
+
+    def generate(self):
+        """ Return the metrics in the Prometheus text format. In multiprocess mode,
+        the metrics of all processes are aggregated.
+
+        Returns
+        -------
+        bytes
+            The metrics.
+        """
+        registry = self.registry
+        if _multiprocess_dir():
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.generate_latest(registry)
+
+    def register_route(self, server):
+        """ Expose the metrics at `route` of the flask server.
+
+        Parameters
+        ----------
+        server: flask.Flask
+            The flask server of the app.
+        """
+
+        def serve():
+            return flask.Response(
+                self.generate(), content_type=prometheus_client.CONTENT_TYPE_LATEST
+            )
+
+        server.add_url_rule(self.route, "dasher_metrics", serve)
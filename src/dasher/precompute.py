@@ -0,0 +1,205 @@
+""" Precomputation of the results of callbacks with finite inputs.
+
+If every widget of a callback has a finite ``domain``, e.g. dropdowns, checkboxes and
+sliders, the possible calls of the callback function form the Cartesian product of
+the widget values. ``precompute`` evaluates these calls in a process pool and stores
+the results in the cache of the callback before the app receives traffic.
+
+Grids exceeding `max_points` combinations are sampled. Combinations already present
+in the cache are skipped, so that an interrupted precomputation using a persistent
+cache resumes where it stopped.
+"""
+
+import os
+import random
+import warnings
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from functools import reduce
+from operator import mul
+
+from .cache import function_fingerprint
+from .cache import generate_cache_key
+
+PrecomputeInfo = namedtuple(
+    "PrecomputeInfo", ["total", "points", "computed", "skipped", "failed"]
+)
+""" Statistics of a precomputation, as returned by ``precompute``. """
+
+
+def parameter_grid(widgets):
+    """ Return the values of each widget of a callback.
+
+    Parameters
+    ----------
+    widgets: list of BaseWidget
+        The widgets of the callback.
+
+    Returns
+    -------
+    list of list
+        The ``domain`` of each widget.
+    """
+    domains = []
+    for widget in widgets:
+        domain = widget.domain()
+        if domain is None:
+            raise ValueError(f"the values of widget {widget.name!r} are not finite")
+        domains.append(list(domain))
+    return domains
+
+
+def _point(domains, index):
+    # decode the index of a combination in the mixed radix of the domain sizes
+    point = []
+    for domain in reversed(domains):
+        index, i = divmod(index, len(domain))
+        point.append(domain[i])
+    return tuple(reversed(point))
+
+
+def grid_points(domains, max_points=None, seed=0):
+    """ Yield the combinations of the widget values.
+    If there are more than `max_points` combinations, a random sample of `max_points`
+    combinations is drawn without materializing the grid.
+
+    Parameters
+    ----------
+    domains: list of list
+        The values of each widget.
+    max_points: int, optional
+        Maximum number of combinations. Unlimited if ``None``.
+    seed: int, optional
+        Seed of the random sample, so that a resumed precomputation draws the same
+        sample. Default: 0.
+
+    Yields
+    ------
+    tuple
+        Combination of widget values.
+    """
+    total = reduce(mul, (len(domain) for domain in domains), 1)
+    if max_points is None or total <= max_points:
+        indexes = range(total)
+    else:
+        rng = random.Random(seed)
+        sample = set()
+        while len(sample) < max_points:
+            sample.add(rng.randrange(total))
+        indexes = sorted(sample)
+    for index in indexes:
+        yield _point(domains, index)
+
+
+def precompute(
+    callback, workers=None, max_points=10000, seed=0, progress=None, executor=None
+):
+    """ Evaluate the callback function for every combination of widget values and
+    store the results in the cache of the callback. The function is evaluated as
+    wrapped by the api up to the cache (``Callback.compute``), e.g. with its figures
+    downsampled.
+
+    Parameters
+    ----------
+    callback: dasher.base.Callback
+        The callback to precompute. It must have a cache and all its widgets must
+        have a finite ``domain``.
+    workers: int, optional
+        Number of worker processes. If 0, the combinations are evaluated in the
+        calling process. Default: number of CPUs.
+    max_points: int, optional
+        Maximum number of combinations to evaluate. Larger grids are sampled.
+        Unlimited if ``None``. Default: 10000.
+    seed: int, optional
+        Seed used for sampling large grids. Default: 0.
+    progress: callable, optional
+        Called as ``progress(value, total, message)`` after each combination, e.g.
+        a ``dasher.jobs.Progress`` handle.
+    executor: concurrent.futures.Executor, optional
+        Executor evaluating the combinations instead of a new process pool with
+        `workers` processes. Its ``max_workers`` attribute, if any, bounds the
+        number of pending combinations instead of `workers`.
+
+    Returns
+    -------
+    PrecomputeInfo
+        Named tuple containing the size of the grid, the number of combinations
+        considered and the number of computed, skipped and failed combinations.
+    """
+    if callback.cache is None:
+        raise ValueError(f"callback {callback.name!r} has no cache")
+    if callback.compute is None:
+        raise ValueError(f"callback {callback.name!r} is not registered")
+
+    domains = parameter_grid(callback.widgets)
+    total = reduce(mul, (len(domain) for domain in domains), 1)
+    n_points = total if max_points is None else min(total, max_points)
+    fingerprint = function_fingerprint(callback.f)
+    cache = callback.cache
+    maxsize = getattr(cache, "maxsize", None)
+    if maxsize is not None and n_points > maxsize:
+        warnings.warn(
+            f"{n_points} combinations of callback {callback.name!r} exceed the "
+            f"capacity of its cache of {maxsize} entries, so that most results are "
+            "evicted again; increase the maxsize of the cache or reduce max_points"
+        )
+    counts = {"computed": 0, "skipped": 0, "failed": 0}
+
+    def report():
+        if progress is not None:
+            done = sum(counts.values())
+            progress(done, n_points, f"{done} of {n_points} combinations")
+
+    def store(key, future):
+        try:
+            cache.set(key, future.result())
+            counts["computed"] += 1
+        except Exception:
+            counts["failed"] += 1
+        report()
+
+    if executor is None and workers == 0:
+        for args in grid_points(domains, max_points, seed):
+            key = generate_cache_key(callback.f, args, fingerprint)
+            if key in cache:
+                counts["skipped"] += 1
+                report()
+                continue
+            try:
+                cache.set(key, callback.compute(*args))
+                counts["computed"] += 1
+            except Exception:
+                counts["failed"] += 1
+            report()
+        return PrecomputeInfo(total, n_points, **counts)
+
+    if executor is not None:
+        max_workers = getattr(executor, "max_workers", None) or workers
+    else:
+        max_workers = workers
+    pool = executor if executor is not None else ProcessPoolExecutor(workers)
+    window = 4 * (max_workers or os.cpu_count() or 1)
+    pending = {}
+    try:
+        for args in grid_points(domains, max_points, seed):
+            key = generate_cache_key(callback.f, args, fingerprint)
+            if key in cache:
+                counts["skipped"] += 1
+                report()
+                continue
+            pending[pool.submit(callback.compute, *args)] = key
+            # bound the number of results held in memory
+            while len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store(pending.pop(future), future)
+        for future in list(pending):
+            store(pending.pop(future), future)
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=True)
+    return PrecomputeInfo(total, n_points, **counts)
@@ -0,0 +1,204 @@
+""" Sampled profiling of dasher callbacks.
+
+If the app is created with ``profiler_kw``, a fraction of the calls of every callback
+function is executed under ``cProfile``. Calls slower than a threshold are captured
+as well, so that a slow tab can be reproduced with the exact widget values.
+
+Each capture is a directory containing ``capture.json`` with the callback id, the
+arguments, the duration and the hottest functions, and ``profile.prof``, which can be
+inspected using ``pstats`` or tools like snakeviz. Slow calls, which were not sampled,
+have no profile: increase `sample_rate` or call the function with the captured
+arguments to profile them.
+
+The calls are sampled in the app process. For callbacks executed in a worker process
+(``_executor``), the duration includes the round trip to the worker, while the
+profile covers the app process only, i.e. waiting for and receiving the result.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from functools import wraps
+
+
+def hot_functions(profile, top=20):
+    """ Return the functions with the highest cumulative time of a profile.
+
+    Parameters
+    ----------
+    profile: cProfile.Profile
+        The profile.
+    top: int, optional
+        Number of functions. Default: 20.
+
+    Returns
+    -------
+    list of dict
+        Function, number of calls, total time and cumulative time of the functions.
+    """
+    stats = pstats.Stats(profile)
+    stats.sort_stats("cumulative")
+    functions = []
+    for function in stats.fcn_list[:top]:
+        _, ncalls, tottime, cumtime, _ = stats.stats[function]
+        functions.append(
+            {
+                "function": pstats.func_std_string(function),
+                "ncalls": ncalls,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            }
+        )
+    return functions
+
+
+class Profiler(object):
+    """ Profiles a fraction of the callback calls and captures slow calls.
+
+    Parameters
+    ----------
+    directory: str, optional
+        Directory of the captures. It is created if it does not exist.
+        Default: "dasher-profiles".
+    sample_rate: float, optional
+        Fraction of the calls, which are profiled. Default: 0.01.
+    slow_threshold: float, optional
+        Calls taking longer than `slow_threshold` seconds are captured, whether they
+        were profiled or not. Disabled if ``None``. Default: 1.
+    top: int, optional
+        Number of hot functions stored in a capture. Default: 20.
+
+    Attributes
+    ----------
+    calls: int
+        Number of calls.
+    profiled: int
+        Number of profiled calls.
+    captured: int
+        Number of captures.
+    """
+
+    def __init__(
+        self, directory="dasher-profiles", sample_rate=0.01, slow_threshold=1.0, top=20
+    ):
+        self.directory = os.path.abspath(directory)
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.top = top
+        self.calls = 0
+        self.profiled = 0
+        self.captured = 0
+        # only one profiler can be active at a time in some python versions
+        self._profiling = threading.Lock()
+        self._lock = threading.Lock()
+
+    def call(self, callback_id, f, args, kwargs):
+        """ Call `f`, profiling it if the call is sampled, and capture the call if it
+        was profiled or slow.
+
+        Parameters
+        ----------
+        callback_id: str
+            Id of the callback.
+        f: callable
+            The callback function.
+        args: tuple
+            Positional arguments, i.e. the widget values.
+        kwargs: dict
+            Keyword arguments.
+
+        Returns
+        -------
+        object
+            The result of the call.
+        """
+        with self._lock:
+            self.calls += 1
+        profile = None
+        sampled = random.random() < self.sample_rate
+        if sampled and self._profiling.acquire(blocking=False):
+            profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            if profile is None:
+                return f(*args, **kwargs)
+            with self._lock:
+                self.profiled += 1
+            try:
+                return profile.runcall(f, *args, **kwargs)
+            finally:
+                self._profiling.release()
+        finally:
+            duration = time.perf_counter() - start
+            slow = self.slow_threshold is not None and duration > self.slow_threshold
+            if profile is not None or slow:
+                self.capture(callback_id, args, duration, profile)
+
+    def capture(self, callback_id, args, duration, profile=None):
+        """ Save a capture of a call.
+
+        Parameters
+        ----------
+        callback_id: str
+            Id of the callback.
+        args: tuple
+            Positional arguments of the call.
+        duration: float
+            Duration of the call in seconds.
+        profile: cProfile.Profile, optional
+            Profile of the call.
+
+        Returns
+        -------
+        str
+            Directory of the capture.
+        """
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{callback_id}-{uuid.uuid4().hex[:8]}"
+        path = os.path.join(self.directory, name)
+        os.makedirs(path, exist_ok=True)
+        capture = {
+            "callback": callback_id,
+            "args": list(args),
+            "duration": duration,
+            "slow": self.slow_threshold is not None and duration > self.slow_threshold,
+            "profiled": profile is not None,
+            "hot_functions": [],
+        }
+        if profile is not None:
+            profile.dump_stats(os.path.join(path, "profile.prof"))
+            capture["hot_functions"] = hot_functions(profile, self.top)
+        with open(os.path.join(path, "capture.json"), "w") as fh:
+            json.dump(capture, fh, indent=2, default=repr)
+        with self._lock:
+            self.captured += 1
+        return path
+
+
+def profiled(f, profiler, callback_id):
+    """ Wrap `f`, so that its calls are sampled by `profiler`.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function.
+    profiler: Profiler
+        The profiler.
+    callback_id: str
+        Id of the callback, which is stored in the captures.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return profiler.call(callback_id, f, args, kwargs)
+
+    return wrapper
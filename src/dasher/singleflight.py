@@ -0,0 +1,245 @@
+""" Coalescing of identical concurrent callback calls.
+
+A callback decorated with the ``_singleflight`` option executes a call only once if
+identical calls, i.e. calls with the same widget values, arrive while it is running.
+The later calls wait for the running call and share its result (or exception).
+
+``SingleFlight`` coalesces the calls within a process using locks. ``FileSingleFlight``
+additionally serializes identical calls of multiple worker processes using lock files.
+Since processes can not share the result in memory, it should be combined with a cache
+shared by the processes, e.g. a ``SQLiteCache``: the waiting processes find the result
+of the first process in the cache once its lock is released.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+from functools import wraps
+
+from .cache import function_fingerprint
+from .cache import generate_cache_key
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+FlightInfo = namedtuple("FlightInfo", ["calls", "coalesced", "waited"])
+""" Single-flight statistics, as returned by ``SingleFlight.info``. """
+
+
+class _Flight(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight(object):
+    """ Thread-safe coalescing of identical concurrent calls within a process.
+
+    Attributes
+    ----------
+    calls: int
+        Number of calls.
+    coalesced: int
+        Number of calls, which waited for an identical running call and shared its
+        result.
+    waited: int
+        Number of calls, which waited for an identical call of another process.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self.waited = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, f, *args, **kwargs):
+        """ Call `f`, unless a call with the same `key` is running already. In that
+        case, wait for the running call and return its result.
+
+        Parameters
+        ----------
+        key: str
+            Key identifying identical calls.
+        f: callable
+            The function to call.
+        *args, **kwargs:
+            Arguments of the call.
+
+        Returns
+        -------
+        object
+            The result of the call.
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.exception is not None:
+                raise flight.exception
+            return flight.result
+
+        try:
+            flight.result = self._run(key, f, args, kwargs)
+        except BaseException as e:
+            flight.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def _run(self, key, f, args, kwargs):
+        return f(*args, **kwargs)
+
+    def info(self):
+        """ Return the statistics of the single-flight layer.
+
+        Returns
+        -------
+        FlightInfo
+            Named tuple containing the number of calls, coalesced calls and calls,
+            which waited for another process.
+        """
+        return FlightInfo(self.calls, self.coalesced, self.waited)
+
+
+class FileSingleFlight(SingleFlight):
+    """ Coalescing of identical concurrent calls within a process and serialization
+    of identical calls across processes using lock files.
+
+    The keys are distributed over a fixed number of lock files, so that the number
+    of files is bounded. Only available on platforms supporting ``fcntl.flock``.
+
+    Parameters
+    ----------
+    directory: str
+        Directory of the lock files, which must be shared by the processes. It is
+        created if it does not exist.
+    stripes: int, optional
+        Number of lock files. Default: 256.
+    timeout: float, optional
+        Maximum number of seconds to wait for another process. The call is executed
+        anyway if it is exceeded. Unlimited if ``None``.
+    poll_interval: float, optional
+        Number of seconds between attempts to acquire a lock held by another
+        process. Default: 0.01.
+    """
+
+    def __init__(self, directory, stripes=256, timeout=None, poll_interval=0.01):
+        if fcntl is None:  # pragma: no cover
+            raise RuntimeError("FileSingleFlight requires fcntl.flock")
+        super().__init__()
+        self.directory = os.path.abspath(directory)
+        self.stripes = stripes
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        stripe = int(hashlib.sha256(key.encode("utf-8")).hexdigest(), 16) % self.stripes
+        return os.path.join(self.directory, f"dasher-{stripe}.lock")
+
+    def _acquire(self, fh):
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            pass
+        with self._lock:
+            self.waited += 1
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                pass
+        return False
+
+    def _run(self, key, f, args, kwargs):
+        with open(self._path(key), "a") as fh:
+            locked = self._acquire(fh)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                if locked:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+_BACKENDS = {"memory": SingleFlight, "file": FileSingleFlight}
+
+
+def create_singleflight(spec):
+    """ Create a single-flight layer from the ``_singleflight`` option of a callback.
+
+    Parameters
+    ----------
+    spec: bool, dict, SingleFlight or None
+        ``None`` or ``False`` disables coalescing, ``True`` creates a
+        ``SingleFlight``. A dictionary is passed as keyword arguments to the backend
+        selected by its optional ``"backend"`` key, which is either ``"memory"``
+        (``SingleFlight``, default) or ``"file"`` (``FileSingleFlight``). A
+        ``SingleFlight`` instance is used as-is.
+
+    Returns
+    -------
+    SingleFlight or None
+        The created single-flight layer.
+    """
+    if spec is None or spec is False:
+        return None
+    elif spec is True:
+        return SingleFlight()
+    elif isinstance(spec, SingleFlight):
+        return spec
+    elif isinstance(spec, dict):
+        spec = dict(spec)
+        backend = spec.pop("backend", "memory")
+        if backend not in _BACKENDS:
+            raise ValueError(f"unknown single-flight backend {backend!r}")
+        return _BACKENDS[backend](**spec)
+    else:
+        raise TypeError("_singleflight must be a bool, dict or SingleFlight instance")
+
+
+def coalesced(f, flight):
+    """ Wrap `f`, so that identical concurrent calls are coalesced by `flight`.
+    Calls are identical if their positional arguments are equal, keyword arguments
+    are passed through to `f`.
+
+    Parameters
+    ----------
+    f: callable
+        The callback function.
+    flight: SingleFlight
+        The single-flight layer.
+
+    Returns
+    -------
+    callable
+        The wrapped function.
+    """
+
+    fingerprint = function_fingerprint(f)
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        key = generate_cache_key(f, args, fingerprint)
+        return flight.do(key, f, *args, **kwargs)
+
+    return wrapper
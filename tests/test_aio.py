@@ -0,0 +1,45 @@
+import asyncio
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from dasher import Dasher
+from dasher.aio import EventLoop
+
+
+def test_async_callback_runs_concurrently():
+    app = Dasher(__name__)
+
+    events = []
+
+    async def fetch(x):
+        events.append(("start", x))
+        await asyncio.sleep(0.05)
+        events.append(("end", x))
+        return x
+
+    @app.callback("fan out", x=1)
+    async def f(x):
+        return list(await asyncio.gather(fetch(x), fetch(x + 1), fetch(x + 2)))
+
+    client = app.get_flask_server().test_client()
+    response = client.post(
+        "/_dash-update-component",
+        json={
+            "output": "dasher-output-fan_out.children",
+            "outputs": {"id": "dasher-output-fan_out", "property": "children"},
+            "inputs": [{"id": "x", "property": "value", "value": 5}],
+        },
+    )
+    output = response.get_json()["response"]["dasher-output-fan_out"]["children"]
+    assert output == [5, 6, 7]
+    # the fetches overlap: all of them start before the first one ends
+    assert [event for event, _ in events] == ["start"] * 3 + ["end"] * 3
+
+
+def test_event_loop_timeout():
+    loop = EventLoop(timeout=0.05)
+    with pytest.raises(TimeoutError):
+        loop.run(asyncio.sleep(1))
+    assert loop.run(asyncio.sleep(0, result=3)) == 3
+    loop.close()
@@ -0,0 +1,34 @@
+from collections import OrderedDict
+
+import dash
+import pytest
+
+from dasher import Api
+from dasher import Dasher
+from dasher.layout.bootstrap.widgets import IterableWidget
+from dasher.layout.bootstrap.widgets import StringWidget
+
+
+def test_generate_widget_dispatch_cache():
+    api = Api()
+    assert isinstance(api.generate_widget("a", "text"), StringWidget)
+    assert isinstance(api.generate_widget("b", ["x", "y"]), IterableWidget)
+    assert api._dispatch_cache[str] is StringWidget
+
+    # changing the widget specification invalidates the cache
+    api.layout.widget_spec = OrderedDict(api.layout.widget_spec)
+    assert isinstance(api.generate_widget("a", "text"), StringWidget)
+    api.layout.widget_spec[str] = IterableWidget
+    assert isinstance(api.generate_widget("a", "text"), IterableWidget)
+
+
+def test_register_callback_static():
+    app = Dasher(__name__)
+    app.callback("plain", x=1)(lambda x: [x])
+    app.callback("background", _background=True, x=1)(lambda x: [x])
+
+    other = dash.Dash(__name__)
+    Api.register_callback(other, app.callbacks["plain"])
+    assert "dasher-output-plain.children" in other.callback_map
+    with pytest.raises(ValueError, match="layout"):
+        Api.register_callback(other, app.callbacks["background"])
@@ -0,0 +1,128 @@
+import threading
+import time
+
+from dasher import Dasher
+from dasher.cache import MemoryCache
+from dasher.cache import SQLiteCache
+from dasher.cache import generate_cache_key
+
+
+def test_memory_cache_lru():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.info() == (1, 1, 1, 2, cache.nbytes, 0)
+
+
+def test_memory_cache_max_bytes():
+    cache = MemoryCache(maxsize=None, max_bytes=2000)
+    cache.set("small", "x")
+    cache.set("too_large", "x" * 3000)
+    assert len(cache) == 1
+    cache.set("a", "x" * 900)
+    cache.set("b", "x" * 900)
+    cache.set("c", "x" * 900)
+    assert cache.get("a") == (False, None)
+    assert cache.get("c") == (True, "x" * 900)
+    assert len(cache) == 2
+    assert cache.nbytes <= 2000
+    assert cache.evictions == 2
+
+
+def test_memory_cache_ttl():
+    cache = MemoryCache(ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") == (False, None)
+    assert cache.evictions == 1
+
+
+def test_callback_cache():
+    app = Dasher(__name__)
+    calls = []
+
+    @app.callback("cached", _cache={"maxsize": 8}, text="hello")
+    def f(text):
+        calls.append(text)
+        return [text]
+
+    wrapped = app.app.callback_map["dasher-output-cached.children"]["callback"]
+    outputs_list = {"id": "dasher-output-cached", "property": "children"}
+    first = wrapped("a", outputs_list=outputs_list)
+    wrapped("b", outputs_list=outputs_list)
+    assert wrapped("a", outputs_list=outputs_list) == first
+    assert calls == ["a", "b"]
+    assert app.callbacks["cached"].cache_info()[:3] == (1, 2, 0)
+
+
+def test_callback_cache_skips_unpicklable_results():
+    app = Dasher(__name__)
+    calls = []
+
+    @app.callback("locked", _cache=True, text="hello")
+    def f(text):
+        calls.append(text)
+        return [text, threading.Lock()]
+
+    callback = app.callbacks["locked"]
+    wrapped = app.api.wrap_function(callback)
+    assert wrapped("a")[0] == "a"
+    assert wrapped("a")[0] == "a"
+    assert calls == ["a", "a"]
+    info = callback.cache_info()
+    assert (info.misses, info.size, info.unpicklable) == (2, 0, 2)
+
+
+def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, max_bytes=2000)
+    cache.set("a", "x" * 900)
+    cache.set("b", "x" * 900)
+    assert cache.get("a") == (True, "x" * 900)
+    cache.set("c", "x" * 900)
+    assert cache.get("b") == (False, None)
+    assert cache.evictions == 1
+
+    # a second instance, e.g. in another worker process, shares the entries
+    other = SQLiteCache(path)
+    assert other.get("c") == (True, "x" * 900)
+    assert len(other) == 2
+
+
+def test_sqlite_cache_namespaces(tmp_path):
+    app = Dasher(__name__)
+    spec = {"backend": "sqlite", "path": str(tmp_path / "cache.db"), "max_bytes": 2000}
+    for name in ("first", "second"):
+        app.callback(name, _cache=spec, n=(0, 3))(lambda n: ["x" * 900])
+    first, second = (app.callbacks[name].cache for name in ("first", "second"))
+    for n in range(3):
+        app.api.wrap_function(app.callbacks["first"])(n)
+    app.api.wrap_function(app.callbacks["second"])(0)
+
+    # the entries of the other callback are neither counted nor evicted
+    assert (len(first), len(second)) == (2, 1)
+    assert first.evictions == 1 and second.evictions == 0
+    assert second.nbytes < 1000 < first.nbytes
+    assert [row.cache for row in app.memory_report()] == [first.nbytes, second.nbytes]
+
+    # reads don't write to the database
+    changes = second._connection().total_changes
+    assert app.api.wrap_function(app.callbacks["second"])(0) == ["x" * 900]
+    assert second._connection().total_changes == changes
+
+
+def test_cache_key_depends_on_code():
+    def f(x):
+        return x + 1
+
+    key = generate_cache_key(f, (1,))
+    assert generate_cache_key(f, (1,)) == key
+    assert generate_cache_key(f, (2,)) != key
+
+    def f(x):  # noqa: F811
+        return x + 2
+
+    assert generate_cache_key(f, (1,)) != key
@@ -1,5 +1,67 @@
+import json
+
 from dasher import Dasher
 
 
 def test_instantiation():
     return Dasher(__name__)
+
+
+def test_submit_mode():
+    app = Dasher(__name__)
+
+    @app.callback("submit", _submit="submit", text="hello", n=(1, 10))
+    def f(text, n):
+        return [text * n]
+
+    spec = app.app.callback_map["dasher-output-submit.children"]
+    assert spec["inputs"] == [{"id": "dasher-submit-submit", "property": "n_clicks"}]
+    assert [s["id"] for s in spec["state"]] == ["text-submit", "n-submit"]
+
+    response = spec["callback"](
+        1, "ab", 2, outputs_list={"id": "dasher-output-submit", "property": "children"}
+    )
+    children = json.loads(response)["response"]["dasher-output-submit"]["children"]
+    assert children == ["abab"]
+
+
+def test_debounce_mode():
+    app = Dasher(__name__)
+
+    @app.callback("debounce", _submit="debounce", text="hello")
+    def f(text):
+        return [text]
+
+    assert app.callbacks["debounce"].widgets[0].component.debounce
+
+
+def test_preview():
+    app = Dasher(__name__)
+
+    def preview(text, n):
+        return [f"preview {text} {n}"]
+
+    @app.callback("drag", _preview=preview, text="hello", n=(1, 10))
+    def f(text, n):
+        return [text * n]
+
+    assert app.callbacks["drag"].widgets[1].drag_dependency == "drag_value"
+    spec = app.app.callback_map["dasher-preview-drag.children"]
+    assert spec["inputs"] == [{"id": "dasher-preview-request-drag", "property": "data"}]
+    assert [s["id"] for s in spec["state"]] == ["text-drag", "n-drag"]
+
+    response = spec["callback"](
+        {"values": [7], "time": 0},
+        "ab",
+        2,
+        outputs_list={"id": "dasher-preview-drag", "property": "children"},
+    )
+    children = json.loads(response)["response"]["dasher-preview-drag"]["children"]
+    assert children == ["preview ab 7"]
+
+    toggle = "..dasher-output-drag.style...dasher-preview-drag.style.."
+    # releasing the slider resets the toggle, also if the output is not updated
+    inputs = app.app.callback_map[toggle]["inputs"]
+    assert {"id": "n-drag", "property": "value"} in inputs
+    card = app.api.layout.get_card("drag")
+    assert "dasher-preview-drag" in str(card)
@@ -0,0 +1,85 @@
+import dash_core_components as dcc
+import dash_html_components as html
+import numpy as np
+import plotly.graph_objects as go
+
+from dasher import Dasher
+from dasher.downsample import Downsampler
+from dasher.downsample import lttb
+from dasher.downsample import minmax
+
+
+def test_lttb_keeps_endpoints_and_peak():
+    x = np.arange(10000)
+    y = np.zeros(10000)
+    y[4321] = 100
+    indexes = lttb(x, y, 100)
+    assert len(indexes) == 100
+    assert indexes[0] == 0 and indexes[-1] == 9999
+    assert 4321 in indexes
+    assert np.all(np.diff(indexes) > 0)
+
+
+def test_minmax_keeps_extrema():
+    x = np.arange(10001)
+    y = np.sin(x / 100.0)
+    y[777] = -5
+    indexes = minmax(x, y, 200)
+    assert len(indexes) <= 200
+    assert 777 in indexes and np.argmax(y) in indexes
+    assert indexes[0] == 0 and indexes[-1] == 10000
+
+
+def test_downsample_figure_skips_small_and_unsorted_traces():
+    x = np.arange(5000)
+    figure = go.Figure(
+        [
+            go.Scatter(x=x, y=x**2),
+            go.Scatter(y=[1, 2, 3]),
+            go.Scatter(x=x[::-1], y=x),
+            go.Bar(x=x, y=x),
+        ]
+    )
+    figure, full = Downsampler(max_points=500).downsample_figure(figure)
+    assert list(full) == [0]
+    assert len(figure["data"][0]["x"]) == 500
+    assert [len(t["y"]) for t in figure["data"][1:]] == [3, 5000, 5000]
+
+
+def test_downsample_callback_and_zoom():
+    app = Dasher(__name__)
+    x = np.linspace(0, 100, 20000)
+
+    @app.callback("plot", _downsample={"max_points": 300}, n=2)
+    def plot(n):
+        return [html.Div(dcc.Graph(figure={"data": [{"x": x, "y": np.sin(n * x)}]}))]
+
+    callback = app.callbacks["plot"]
+    f = app.api.wrap_function(callback)
+    (div,) = f(1)
+    graph = div.children
+    assert len(graph.figure["data"][0]["x"]) == 300
+    assert graph.id["type"] == Downsampler.graph_type
+
+    figure = {"data": [{"x": [], "y": []}], "layout": {}}
+    relayout = {"xaxis.range[0]": 10, "xaxis.range[1]": 20}
+    zoomed = callback.downsample.zoom(relayout, graph.id, figure)
+    xs = zoomed["data"][0]["x"]
+    assert len(xs) == 300
+    assert xs[0] < 10.01 and xs[-1] > 19.99 and xs[-1] < 20.1
+    assert zoomed["layout"]["xaxis"] == {"range": [10, 20], "autorange": False}
+
+    reset = callback.downsample.zoom({"xaxis.autorange": True}, graph.id, figure)
+    assert reset["layout"]["xaxis"] == {"autorange": True}
+    assert reset["data"][0]["x"][-1] == 100
+
+    # traces missing, e.g. after a hit of a persistent cache, are computed again
+    callback.downsample.figures.clear()
+    zoomed = callback.downsample.zoom(relayout, graph.id, figure, 1)
+    assert len(zoomed["data"][0]["x"]) == 300
+    assert graph.id["index"] in callback.downsample.figures
+
+    output = str(callback.outputs)
+    assert any(
+        Downsampler.graph_type in key and key != output for key in app.app.callback_map
+    )
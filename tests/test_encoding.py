@@ -0,0 +1,56 @@
+import json
+
+import dash
+import dash_core_components as dcc
+import numpy as np
+import plotly.graph_objs as go
+import pytest
+from plotly.utils import PlotlyJSONEncoder
+
+from dasher import Dasher
+from dasher.encoding import Encoder
+
+pytest.importorskip("orjson")
+
+
+def test_encoder_matches_plotly_encoder():
+    figure = {"data": [go.Bar(x=[1, 2], y=[3, 4]), {"y": np.arange(3.0)}]}
+    components = [dcc.Graph(id="graph", figure=figure), np.nan, "text"]
+    expected = json.loads(json.dumps(components, cls=PlotlyJSONEncoder))
+    assert json.loads(Encoder().dumps(components)) == expected
+
+
+def test_encoding_kw_callback_response():
+    app = Dasher(__name__, encoding_kw={})
+
+    @app.callback("plot", n=3)
+    def f(n):
+        return [dcc.Graph(figure={"data": [{"y": np.arange(n)}]})]
+
+    client = app.get_flask_server().test_client()
+    response = client.post(
+        "/_dash-update-component",
+        json={
+            "output": "dasher-output-plot.children",
+            "outputs": {"id": "dasher-output-plot", "property": "children"},
+            "inputs": [{"id": "n", "property": "value", "value": 4}],
+        },
+    )
+    (graph,) = response.get_json()["response"]["dasher-output-plot"]["children"]
+    assert graph["props"]["figure"]["data"][0]["y"] == [0, 1, 2, 3]
+
+    response = client.post(
+        "/_dash-update-component",
+        json={
+            "output": "dasher-output-plot.children",
+            "outputs": {"id": "other", "property": "children"},
+            "inputs": [{"id": "n", "property": "value", "value": 4}],
+        },
+    )
+    assert response.status_code == 500
+
+
+def test_encoder_requires_dash_1(monkeypatch):
+    monkeypatch.setattr(dash, "__version__", "2.0.0")
+    with pytest.raises(RuntimeError, match="dash 1.x"):
+        Dasher(__name__, encoding_kw={})
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from dasher import Dasher
+from dasher import executors
+from dasher.executors import FunctionReference
+from dasher.executors import ProcessExecutor
+
+
+def getpid(x):
+    return x, os.getpid()
+
+
+# importing the module registers the function in spawned workers
+GETPID = FunctionReference(getpid)
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def make_function(value):
+    def f():
+        return value
+
+    return f
+
+
+def test_process_executor_recycles_workers():
+    executor = ProcessExecutor(max_workers=1, max_tasks_per_child=2)
+    try:
+        pids = [executor.run(GETPID, (i,))[1] for i in range(4)]
+    finally:
+        executor.shutdown()
+    assert os.getpid() not in pids
+    assert pids[0] == pids[1] != pids[2] == pids[3]
+    assert executor.recycled == (0 if executor.native_recycling else 1)
+
+
+def test_process_executor_timeout():
+    executor = ProcessExecutor(max_workers=1, timeout=0.1)
+    with pytest.raises(TimeoutError):
+        executor.run(FunctionReference(sleep), (10,))
+    assert executor.run(FunctionReference(getpid), (1,))[0] == 1
+    executor.shutdown()
+
+
+def test_process_executor_timeout_spares_other_calls():
+    executor = ProcessExecutor(max_workers=2, timeout=1.5)
+    results = []
+
+    def run_other():
+        time.sleep(1.0)
+        results.append(executor.run(FunctionReference(sleep), (1.0,)))
+
+    thread = threading.Thread(target=run_other)
+    thread.start()
+    try:
+        with pytest.raises(TimeoutError):
+            executor.run(FunctionReference(sleep), (10,))
+        thread.join()
+        # the workers of the timed out pool are terminated after the other call
+        assert results == [1.0]
+        assert executor._retired == {}
+        assert executor.run(FunctionReference(getpid), (1,))[0] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_function_reference_local_functions():
+    a, b = FunctionReference(make_function("a")), FunctionReference(make_function("b"))
+    assert a.qualname == b.qualname
+    assert (a(), b()) == ("a", "b")
+
+
+def test_function_reference_resolves_registered_functions_only():
+    reference = FunctionReference(make_function)
+    del executors._functions[(reference.module, reference.qualname, reference.id)]
+    # the attribute of the module is not used, it may be wrapped by dash
+    with pytest.raises(LookupError, match="not registered"):
+        reference.resolve()
+
+
+def test_process_callback():
+    app = Dasher(__name__, executor_kw={"max_workers": 1})
+
+    @app.callback("process", _executor="process", text="hello")
+    def f(text):
+        return [text, os.getpid()]
+
+    wrapped = app.app.callback_map["dasher-output-process.children"]["callback"]
+    response = wrapped(
+        "hi", outputs_list={"id": "dasher-output-process", "property": "children"}
+    )
+    app.executor.shutdown()
+    text, pid = json.loads(response)["response"]["dasher-output-process"]["children"]
+    assert text == "hi"
+    assert pid != os.getpid()
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from dasher import Dasher
+from dasher.cli import main
+
+
+def create_app():
+    app = Dasher(__name__)
+    app.callback("power", n=(0, 3), squared=True)(
+        lambda n, squared: [n**2 if squared else n]
+    )
+    app.callback("choice", _submit="submit", name=["a", "b"])(lambda name: [name])
+    return app
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_export(tmpdir, workers):
+    info = create_app().export(str(tmpdir), workers=workers)
+    assert (info.results, info.failed) == (2 + 8 + 2, 0)
+
+    assert "_dasher/export/" in tmpdir.join("index.html").read()
+    assert tmpdir.join("_dash-layout.json").check()
+    suites = tmpdir.join("_dash-component-suites", "dash_core_components")
+    assert any(path.basename.startswith("async-slider.v") for path in suites.listdir())
+
+    results = tmpdir.join("_dasher", "export")
+    index = json.loads(results.join("index.json").read())
+    power = json.loads(
+        results.join(index["dasher-output-power.children"]["index"]).read()
+    )
+    response = json.loads(results.join(power["[3,true]"]).read())
+    assert response["response"]["dasher-output-power"]["children"] == [9]
+
+    choice = index["dasher-output-choice.children"]
+    assert choice["skip"] == 1
+    assert '["b"]' in json.loads(results.join(choice["index"]).read())
+
+
+def test_export_small_steps(tmpdir):
+    app = Dasher(__name__)
+    app.callback("small", x=(0.0, 0.0001, 0.00001))(lambda x: [x])
+    app.callback("tiny", x=(0.0, 2e-7, 1e-7))(lambda x: [x])
+    app.export(str(tmpdir), workers=0)
+
+    # keys must match JSON.stringify, Python writes 1e-05 and 1e-07 instead
+    results = tmpdir.join("_dasher", "export")
+    index = json.loads(results.join("index.json").read())
+
+    def keys(name):
+        path = index[f"dasher-output-{name}.children"]["index"]
+        return set(json.loads(results.join(path).read()))
+
+    assert {"[0]", "[0.00001]", "[0.00005]", "[0.0001]"} <= keys("small")
+    assert keys("tiny") == {"[0]", "[1e-7]", "[2e-7]"}
+
+
+def test_export_cli(tmpdir, monkeypatch):
+    tmpdir.join("exported_app.py").write(
+        "from test_export import create_app\napp = create_app()\n"
+    )
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.syspath_prepend(os.path.dirname(__file__))
+    assert main(["export", "exported_app:app", "site", "--workers", "0"]) == 0
+    assert tmpdir.join("site", "index.html").check()
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+
+import dash_core_components as dcc
+import numpy as np
+import pytest
+from dash.exceptions import PreventUpdate
+
+from dasher import Dasher
+from dasher.jobs import JobCancelled
+from dasher.jobs import JobManager
+from dasher.jobs import streamed
+
+
+def test_job_manager_progress():
+    def f(n, _progress):
+        for i in range(n):
+            _progress(i + 1, n, "step")
+        return n
+
+    jobs = JobManager(max_workers=1)
+    job = jobs.submit(f, (3,))
+    job.future.result(timeout=5)
+    assert job.result() == 3
+    assert job.progress.fraction == 1.0
+    assert job.progress.message == "step"
+
+
+def test_job_manager_cancel():
+    started = threading.Event()
+    release = threading.Event()
+
+    def f(_progress):
+        started.set()
+        release.wait(5)
+        _progress(1)
+
+    jobs = JobManager(max_workers=1)
+    job = jobs.submit(f, ())
+    started.wait(5)
+    jobs.cancel(job.id)
+    release.set()
+    with pytest.raises(JobCancelled):
+        job.future.result(timeout=5)
+    assert jobs.get(job.id) is None
+
+
+def test_background_callback():
+    app = Dasher(__name__)
+
+    @app.callback("background", _background=True, text="hello")
+    def f(text):
+        return [text]
+
+    submit = app.app.callback_map["dasher-job-background.data"]["callback"]
+    poll = app.app.callback_map[
+        "..dasher-output-background.children...dasher-job-done-background.data.."
+    ]["callback"]
+
+    response = submit(
+        "hi", None, outputs_list={"id": "dasher-job-background", "property": "data"}
+    )
+    job_id = json.loads(response)["response"]["dasher-job-background"]["data"]
+    app.jobs.get(job_id).future.result(timeout=5)
+
+    response = poll(
+        1,
+        job_id,
+        outputs_list=[
+            {"id": "dasher-output-background", "property": "children"},
+            {"id": "dasher-job-done-background", "property": "data"},
+        ],
+    )
+    response = json.loads(response)["response"]
+    assert response["dasher-output-background"]["children"] == ["hi"]
+    assert app.jobs.get(job_id) is None
+
+
+def test_background_callback_unknown_job():
+    app = Dasher(__name__)
+    app.callback("background", _background=True, text="hello")(lambda text: [text])
+    poll = app.app.callback_map[
+        "..dasher-output-background.children...dasher-job-done-background.data.."
+    ]["callback"]
+    outputs_list = [
+        {"id": "dasher-output-background", "property": "children"},
+        {"id": "dasher-job-done-background", "property": "data"},
+    ]
+
+    # a job of another worker process is reported and stops the polling
+    job_id = f"{os.getpid() + 1}-0123"
+    response = json.loads(poll(1, job_id, outputs_list=outputs_list))["response"]
+    (alert,) = response["dasher-output-background"]["children"]
+    assert "another server process" in alert["props"]["children"]
+    assert response["dasher-job-done-background"]["data"] == job_id
+
+    job_id = f"{os.getpid()}-0123"
+    response = json.loads(poll(1, job_id, outputs_list=outputs_list))["response"]
+    (alert,) = response["dasher-output-background"]["children"]
+    assert "expired" in alert["props"]["children"]
+
+
+def test_generator_callback_streams_partial_results():
+    app = Dasher(__name__)
+    refine = threading.Event()
+
+    @app.callback("stream", text="hello")
+    def f(text):
+        yield ["coarse"]
+        refine.wait(5)
+        yield [text]
+
+    assert app.callbacks["stream"].background is app.jobs
+    submit = app.app.callback_map["dasher-job-stream.data"]["callback"]
+    poll = app.app.callback_map[
+        "..dasher-output-stream.children...dasher-job-done-stream.data.."
+    ]["callback"]
+    outputs_list = [
+        {"id": "dasher-output-stream", "property": "children"},
+        {"id": "dasher-job-done-stream", "property": "data"},
+    ]
+
+    response = submit(
+        "hi", None, outputs_list={"id": "dasher-job-stream", "property": "data"}
+    )
+    job_id = json.loads(response)["response"]["dasher-job-stream"]["data"]
+    job = app.jobs.get(job_id)
+    deadline = time.monotonic() + 5
+    while not job.progress.published and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    response = json.loads(poll(1, job_id, outputs_list=outputs_list))["response"]
+    assert response["dasher-output-stream"]["children"] == ["coarse"]
+    assert "dasher-job-done-stream" not in response
+    with pytest.raises(PreventUpdate):
+        poll(2, job_id, outputs_list=outputs_list)
+
+    refine.set()
+    job.future.result(timeout=5)
+    response = json.loads(poll(3, job_id, outputs_list=outputs_list))["response"]
+    assert response["dasher-output-stream"]["children"] == ["hi"]
+    assert response["dasher-job-done-stream"]["data"] == job_id
+
+
+def test_generator_callback_downsamples_partial_results():
+    app = Dasher(__name__)
+    refine = threading.Event()
+
+    @app.callback("stream", n=5000, _downsample=100)
+    def f(n):
+        yield [dcc.Graph(figure={"data": [{"y": np.arange(float(n))}]})]
+        refine.wait(5)
+        yield ["done"]
+
+    submit = app.app.callback_map["dasher-job-stream.data"]["callback"]
+    poll = app.app.callback_map[
+        "..dasher-output-stream.children...dasher-job-done-stream.data.."
+    ]["callback"]
+    outputs_list = [
+        {"id": "dasher-output-stream", "property": "children"},
+        {"id": "dasher-job-done-stream", "property": "data"},
+    ]
+    response = submit(
+        5000, None, outputs_list={"id": "dasher-job-stream", "property": "data"}
+    )
+    job = app.jobs.get(json.loads(response)["response"]["dasher-job-stream"]["data"])
+    deadline = time.monotonic() + 5
+    while not job.progress.published and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    response = json.loads(poll(1, job.id, outputs_list=outputs_list))["response"]
+    (graph,) = response["dasher-output-stream"]["children"]
+    assert len(graph["props"]["figure"]["data"][0]["y"]) == 100
+    refine.set()
+
+
+def test_generator_callback_rejects_executor():
+    app = Dasher(__name__)
+
+    def f(n):
+        yield n
+
+    with pytest.raises(ValueError, match="generator"):
+        app.callback("stream", n=1, _executor="process")(f)
+
+
+def test_streamed_cancellation_closes_generator():
+    closed = []
+
+    def f(n):
+        try:
+            for i in range(n):
+                yield i
+        finally:
+            closed.append(True)
+
+    jobs = JobManager()
+    finished = jobs.submit(streamed(f), (3,))
+    assert finished.future.result(timeout=5) == 2
+    assert finished.progress.published == 3
+
+    job = jobs.submit(streamed(f), (10**9,))
+    deadline = time.monotonic() + 5
+    while not job.progress.published and time.monotonic() < deadline:
+        time.sleep(0.01)
+    jobs.cancel(job.id)
+    with pytest.raises(JobCancelled):
+        job.future.result(timeout=5)
+    assert closed == [True, True]
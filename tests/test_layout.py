@@ -0,0 +1,55 @@
+import json
+
+from dasher import Dasher
+
+
+def test_cards_rendered_lazily(monkeypatch):
+    app = Dasher(__name__, layout_kw={"max_cached_cards": 2})
+    layout = app.api.layout
+    rendered = []
+    render_card = layout.render_card
+
+    def counting_render_card(callback, **kwargs):
+        rendered.append(callback.id)
+        return render_card(callback, **kwargs)
+
+    monkeypatch.setattr(layout, "render_card", counting_render_card)
+
+    for name in ("a", "b", "c"):
+        app.callback(name, x=1)(lambda x: [x])
+    assert rendered == []
+
+    card = layout.render_callback("a")
+    assert layout.render_callback("a") is card
+    assert rendered == ["a"]
+
+    layout.render_callback("b")
+    layout.render_callback("c")
+    assert list(layout._cards) == ["b", "c"]
+
+    assert layout.render_callback("a") is not card
+    assert rendered == ["a", "b", "c", "a"]
+
+    # Callback.layout delegates to get_card
+    assert app.callbacks["a"].layout is layout.get_card("a")
+    assert rendered == ["a", "b", "c", "a"]
+
+
+def test_clientside_tabs():
+    app = Dasher(__name__, layout_kw={"clientside_tabs": True})
+    for name in ("a", "b"):
+        app.callback(name, x=1)(lambda x: [x])
+
+    layout = app.api.layout
+    assert "dasher-tabs-content.children" not in app.app.callback_map
+    panes = [pane.children[1] for pane in layout.tabs_content.children]
+    assert [pane.id["index"] for pane in panes] == ["a", "b"]
+    assert all(pane.children is None for pane in panes)
+
+    load = app.app.callback_map['{"index":["MATCH"],"type":"dasher-tab-pane"}.children']
+    pane_id = {"type": "dasher-tab-pane", "index": "b"}
+    response = load["callback"](
+        "b", outputs_list={"id": pane_id, "property": "children"}
+    )
+    (card,) = json.loads(response)["response"].values()
+    assert card["children"]["type"] == "Card"
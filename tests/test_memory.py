@@ -0,0 +1,51 @@
+from dasher import Dasher
+
+
+def test_memory_report():
+    app = Dasher(__name__, memory_kw={"sample_rate": 1.0})
+
+    @app.callback("large", _cache=True, items=[str(i) for i in range(10000)])
+    def large(items):
+        return [len([items] * 100000)]
+
+    @app.callback("small", text="abc")
+    def small(text):
+        return [text]
+
+    app.api.layout.render_callback("large")
+    callback = app.app.callback_map["dasher-output-large.children"]["callback"]
+    callback("1", outputs_list={"id": "dasher-output-large", "property": "children"})
+
+    large_row, small_row = app.memory_report()
+    assert large_row.callback == "large"
+    assert large_row.kw > 10000 * 50 > small_row.kw
+    assert large_row.layout > small_row.layout
+    assert large_row.cache > 0
+    assert large_row.samples == 1 and large_row.peak >= 8 * 100000
+    assert small_row.peak is None
+
+    client = app.get_flask_server().test_client()
+    report = client.get("/_dasher/memory").get_json()
+    assert [row["callback"] for row in report] == ["large", "small"]
+
+
+def test_memory_samples_process_callback():
+    app = Dasher(
+        __name__, memory_kw={"sample_rate": 1.0}, executor_kw={"max_workers": 1}
+    )
+
+    @app.callback("process", _executor="process", n=10)
+    def f(n):
+        return [list(range(n * 10000))]
+
+    callback = app.app.callback_map["dasher-output-process.children"]["callback"]
+    try:
+        callback(
+            10, outputs_list={"id": "dasher-output-process", "property": "children"}
+        )
+    finally:
+        app.executor.shutdown()
+
+    (row,) = app.memory_report()
+    # the result of the worker is received in the app process
+    assert row.samples == 1 and row.peak >= 8 * 100000
@@ -0,0 +1,44 @@
+import pytest
+
+from dasher import Dasher
+
+pytest.importorskip("prometheus_client")
+
+
+def test_metrics_endpoint():
+    app = Dasher(__name__, metrics_kw={"route": "/_metrics"})
+
+    @app.callback("square", x=1)
+    def f(x):
+        if x < 0:
+            raise ValueError("negative")
+        return [x * x]
+
+    client = app.get_flask_server().test_client()
+    outputs = {"id": "dasher-output-square", "property": "children"}
+    for value in (2, -1):
+        client.post(
+            "/_dash-update-component",
+            json={
+                "output": "dasher-output-square.children",
+                "outputs": outputs,
+                "inputs": [{"id": "x", "property": "value", "value": value}],
+            },
+        )
+    client.post(
+        "/_dash-update-component",
+        json={
+            "output": "dasher-tabs-content.children",
+            "outputs": {"id": "dasher-tabs-content", "property": "children"},
+            "inputs": [
+                {"id": "dasher-tabs", "property": "active_tab", "value": "square"}
+            ],
+        },
+    )
+
+    metrics = client.get("/_metrics").get_data(as_text=True)
+    labels = 'callback="square",output="dasher-output-square.children"'
+    assert f"dasher_callback_calls_total{{{labels}}} 2.0" in metrics
+    assert f"dasher_callback_errors_total{{{labels}}} 1.0" in metrics
+    assert f"dasher_callback_response_bytes_count{{{labels}}} 1.0" in metrics
+    assert 'dasher_callback_calls_total{callback="render_callback"' in metrics
@@ -0,0 +1,114 @@
+import asyncio
+
+import dash_core_components as dcc
+import numpy as np
+import pytest
+
+from dasher import Dasher
+from dasher.cache import function_fingerprint
+from dasher.cache import generate_cache_key
+from dasher.precompute import grid_points
+
+
+def square(n, flag, name):
+    return [n * n if flag else n, name]
+
+
+def cached_results(callback):
+    fingerprint = function_fingerprint(callback.f)
+    results = {}
+    for (n,) in grid_points([list(callback.widgets[0].domain())]):
+        hit, value = callback.cache.get(
+            generate_cache_key(callback.f, (n,), fingerprint)
+        )
+        if hit:
+            results[n] = value
+    return results
+
+
+def test_grid_points_sampled():
+    domains = [list(range(1000))] * 3
+    points = list(grid_points(domains, max_points=50, seed=1))
+    assert len(set(points)) == 50
+    assert points == list(grid_points(domains, max_points=50, seed=1))
+
+
+def test_precompute_fills_cache():
+    app = Dasher(__name__)
+    app.callback("grid", _cache={"maxsize": None}, n=(0, 4), flag=True, name=["a"])(
+        square
+    )
+    progress = []
+
+    info = app.precompute(
+        "grid", workers=0, progress=lambda *args: progress.append(args)
+    )
+    assert info.total == info.computed == 10
+    assert progress[-1][:2] == (10, 10)
+
+    # resuming skips the cached combinations
+    assert app.precompute("grid", workers=0).skipped == 10
+
+    callback = app.app.callback_map["dasher-output-grid.children"]["callback"]
+    callback(
+        3, True, "a", outputs_list={"id": "dasher-output-grid", "property": "children"}
+    )
+    assert app.callbacks["grid"].cache_info().hits == 1
+
+
+def test_precompute_process_pool():
+    app = Dasher(__name__)
+    app.callback("pool", _cache=True, n=(0, 2), flag=True, name=["a", "b"])(square)
+    info = app.precompute("pool", workers=2, max_points=5)
+    assert (info.total, info.points, info.computed) == (12, 5, 5)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_precompute_async_and_generator_callbacks(workers):
+    app = Dasher(__name__)
+
+    @app.callback("coroutine", _cache=True, n=(0, 3))
+    async def coroutine(n):
+        await asyncio.sleep(0)
+        return [n * n]
+
+    @app.callback("generator", _cache=True, n=(0, 3))
+    def generator(n):
+        yield ["partial"]
+        yield [n * n]
+
+    expected = {n: [n * n] for n in range(4)}
+    for name in ("coroutine", "generator"):
+        assert app.precompute(name, workers=workers).computed == 4
+        assert cached_results(app.callbacks[name]) == expected
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_precompute_caches_downsampled_figures(workers):
+    app = Dasher(__name__)
+    x = np.linspace(0, 100, 20000)
+
+    @app.callback("plot", _cache=True, _downsample={"max_points": 300}, n=(1, 2))
+    def plot(n):
+        return [dcc.Graph(figure={"data": [{"x": x, "y": np.sin(n * x)}]})]
+
+    assert app.precompute("plot", workers=workers).computed == 2
+    results = cached_results(app.callbacks["plot"])
+    for (graph,) in results.values():
+        assert len(graph.figure["data"][0]["x"]) == 300
+
+
+def test_precompute_warns_if_grid_exceeds_cache():
+    app = Dasher(__name__)
+    app.callback("small", _cache={"maxsize": 4}, n=(0, 9))(lambda n: [n])
+    with pytest.warns(UserWarning, match="capacity"):
+        info = app.precompute("small", workers=0)
+    assert info.computed == 10
+    assert len(app.callbacks["small"].cache) == 4
+
+
+def test_precompute_requires_finite_widgets():
+    app = Dasher(__name__)
+    app.callback("text", _cache=True, text="abc")(lambda text: [text])
+    with pytest.raises(ValueError):
+        app.precompute("text", workers=0)
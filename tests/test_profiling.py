@@ -0,0 +1,67 @@
+import json
+import time
+
+from dasher import Dasher
+from dasher.profiling import Profiler
+
+
+def test_profiler_sampled_call(tmpdir):
+    profiler = Profiler(str(tmpdir), sample_rate=1.0, slow_threshold=None, top=5)
+    assert profiler.call("sum", sum, ([1, 2, 3],), {}) == 6
+
+    (capture,) = tmpdir.listdir()
+    assert capture.join("profile.prof").check()
+    data = json.loads(capture.join("capture.json").read())
+    assert data["args"] == [[1, 2, 3]]
+    assert data["profiled"] and not data["slow"]
+    assert 0 < len(data["hot_functions"]) <= 5
+
+
+def test_profiler_slow_callback(tmpdir):
+    app = Dasher(
+        __name__,
+        profiler_kw={
+            "directory": str(tmpdir),
+            "sample_rate": 0,
+            "slow_threshold": 0.01,
+        },
+    )
+
+    @app.callback("slow", x=1)
+    def f(x):
+        time.sleep(0.02)
+        return [x]
+
+    callback = app.app.callback_map["dasher-output-slow.children"]["callback"]
+    callback(3, outputs_list={"id": "dasher-output-slow", "property": "children"})
+
+    (capture,) = tmpdir.listdir()
+    data = json.loads(capture.join("capture.json").read())
+    assert (data["callback"], data["args"], data["slow"]) == ("slow", [3], True)
+    assert not capture.join("profile.prof").check()
+    assert app.profiler.captured == 1
+
+
+def test_profiler_process_callback(tmpdir):
+    app = Dasher(
+        __name__,
+        profiler_kw={"directory": str(tmpdir), "sample_rate": 1.0},
+        executor_kw={"max_workers": 1},
+    )
+
+    @app.callback("process", _executor="process", x=1)
+    def f(x):
+        return [x]
+
+    callback = app.app.callback_map["dasher-output-process.children"]["callback"]
+    try:
+        callback(
+            3, outputs_list={"id": "dasher-output-process", "property": "children"}
+        )
+    finally:
+        app.executor.shutdown()
+
+    profiler = app.profiler
+    assert (profiler.calls, profiler.profiled, profiler.captured) == (1, 1, 1)
+    (capture,) = tmpdir.listdir()
+    assert json.loads(capture.join("capture.json").read())["args"] == [3]
@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dasher import Dasher
+from dasher.singleflight import FileSingleFlight
+from dasher.singleflight import SingleFlight
+
+
+def test_singleflight_coalesces_identical_calls():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        release.wait(5)
+        return x * 2
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "key", f, 21) for _ in range(4)]
+        deadline = time.monotonic() + 5
+        while flight.calls < 4 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert flight.calls == 4
+        release.set()
+        assert [future.result(timeout=5) for future in futures] == [42] * 4
+    assert calls == [21]
+    assert flight.info().coalesced == 3
+
+
+def test_singleflight_shares_exception():
+    flight = SingleFlight()
+
+    def f():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        flight.do("key", f)
+    assert flight.info().calls == 1
+
+
+def test_file_singleflight(tmpdir):
+    # a second instance stands in for another process waiting for the lock
+    first = FileSingleFlight(str(tmpdir))
+    second = FileSingleFlight(str(tmpdir), timeout=0.05)
+
+    def f():
+        return second.do("key", lambda: "second")
+
+    assert first.do("key", f) == "second"
+    assert second.info().waited == 1
+    assert first.do("key", lambda: "first") == "first"
+
+
+def test_singleflight_callback():
+    app = Dasher(__name__)
+
+    @app.callback("coalesced", _singleflight=True, x=1)
+    def f(x):
+        return [x]
+
+    callback = app.app.callback_map["dasher-output-coalesced.children"]["callback"]
+    callback(2, outputs_list={"id": "dasher-output-coalesced", "property": "children"})
+    assert app.callbacks["coalesced"].singleflight_info().calls == 1
@@ -0,0 +1,149 @@
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import dash_core_components as dcc
+import numpy as np
+import pandas as pd
+import pytest
+
+from dasher import Api
+from dasher import Dasher
+from dasher.layout.bootstrap.widgets import IterableWidget
+from dasher.layout.bootstrap.widgets import RangeSliderWidget
+from dasher.layout.bootstrap.widgets import TupleWidget
+
+
+def test_component_is_cached():
+    api = Api()
+    widget = api.generate_widget("dropdown", list(range(1000)))
+    component = widget.component
+    assert widget.component is component
+    assert widget.layout.children[1] is component
+
+    widget.invalidate()
+    assert widget.component is not component
+
+
+def test_passthrough_component_is_cached():
+    api = Api()
+    widget = api.generate_widget("custom", dcc.Input())
+    assert widget.component is widget.component
+    widget.invalidate()
+    assert widget.component.id == "custom"
+
+
+@pytest.mark.parametrize(
+    "x", [(0.0, 1.0, 1e-9), (0.0, 1e12, 1e-3), (0, 10 ** 18), (0, 10 ** 18, 7)]
+)
+def test_slider_marks_huge_ranges(x):
+    tracemalloc.start()
+    start = time.perf_counter()
+    component = TupleWidget("slider", x).component
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert elapsed < 0.1
+    assert peak < 100000
+    assert 2 <= len(component.marks) <= 10
+
+
+def test_integer_slider_marks_on_steps():
+    marks = TupleWidget("slider", (0, 100, 5)).component.marks
+    assert all(i % 5 == 0 for i in marks)
+
+
+def test_large_iterable_dropdown():
+    app = Dasher(__name__)
+    ids = (f"customer-{i:06d}" for i in range(200000))
+
+    @app.callback("large", customer=ids)
+    def f(customer):
+        return [customer]
+
+    widget = app.callbacks["large"].widgets[0]
+    assert widget.large
+    assert len(widget.component.options) == widget.page_size
+
+    search = app.app.callback_map["customer-large.options"]["callback"]
+    response = search(
+        "CUSTOMER-0123",
+        "customer-000000",
+        outputs_list={"id": "customer-large", "property": "options"},
+    )
+    options = json.loads(response)["response"]["customer-large"]["options"]
+    assert [o["value"] for o in options[:-1]] == [
+        f"customer-{i:06d}" for i in range(12300, 12400)
+    ]
+    assert options[-1]["value"] == "customer-000000"
+
+
+def test_large_dropdown_with_list_values():
+    widget = IterableWidget(
+        "pairs", {f"pair {i}": [i, i + 1] for i in range(2000)}, page_size=10
+    )
+    assert widget.large
+    assert widget.component.value == [0, 1]
+
+    # the selected value is delivered by dash as a list
+    options = widget.search("pair 19", [1500, 1501])
+    assert options[0] == {"label": "pair 19", "value": [19, 20]}
+    assert options[-1] == {"label": "pair 1500", "value": [1500, 1501]}
+    assert len(options) == 11
+
+
+def test_numeric_array_widget():
+    x = np.random.default_rng(0).normal(size=1000000)
+    start = time.perf_counter()
+    widget = Api().generate_widget("numeric", x)
+    component = widget.component
+    assert time.perf_counter() - start < 0.1
+    assert isinstance(widget, RangeSliderWidget)
+    assert component.value == [x.min(), x.max()]
+
+
+def test_categorical_array_widget():
+    x = pd.Series(["b", "a", "b", "c"] * 1000, dtype="category")
+    widget = Api().generate_widget("categorical", x)
+    assert [o["value"] for o in widget.component.options] == ["a", "b", "c"]
+
+
+def test_array_widgets_ignore_missing_values():
+    x = np.array([np.nan, 1.0, 3.0])
+    assert Api().generate_widget("numeric", x).component.value == [1.0, 3.0]
+    for empty in (np.array([np.nan, np.nan]), np.array([]), pd.Series([np.nan])):
+        with pytest.raises(ValueError, match="missing"):
+            Api().generate_widget("empty", empty)
+
+    x = np.array(["b", None, "a", np.nan, "b"] * 1000, dtype=object)
+    widget = Api().generate_widget("strings", x)
+    assert [o["value"] for o in widget.component.options] == ["a", "b"]
+
+
+def test_pandas_imported_lazily():
+    code = "import sys, dasher; assert 'pandas' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_datetime_array_callback():
+    app = Dasher(__name__)
+    dates = pd.date_range("2020-01-01", "2020-12-31", freq="h")
+
+    @app.callback("dates", dates=dates, n=3)
+    def f(dates, n):
+        return [dates, n]
+
+    component = app.callbacks["dates"].widgets[0].component
+    assert (component.start_date, component.end_date) == ("2020-01-01", "2020-12-31")
+
+    wrapped = app.app.callback_map["dasher-output-dates.children"]["callback"]
+    response = wrapped(
+        "2020-02-01",
+        "2020-03-01",
+        5,
+        outputs_list={"id": "dasher-output-dates", "property": "children"},
+    )
+    children = json.loads(response)["response"]["dasher-output-dates"]["children"]
+    assert children == [["2020-02-01", "2020-03-01"], 5]